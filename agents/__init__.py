@@ -1,6 +1,8 @@
-from agents.base import BaseAgent, AgentResult
+from agents.base import BaseAgent, BatchableAgent, AgentResult, analyze_many
 
 __all__ = [
     "BaseAgent",
+    "BatchableAgent",
     "AgentResult",
+    "analyze_many",
 ]
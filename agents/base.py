@@ -7,6 +7,7 @@ Base agent utilities for LangGraph-based agents.
 - Use @tool decorator for tool integration
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Optional
@@ -14,6 +15,28 @@ from typing import Any, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models import BaseChatModel
 
+try:
+    import orjson
+
+    def prompt_json(obj: Any) -> str:
+        """Serialize prompt arguments as compact JSON."""
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    import json
+
+    def prompt_json(obj: Any) -> str:
+        """Serialize prompt arguments as compact JSON."""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Prompt budget for code snippets, in tokens of the default review model
+SNIPPET_TOKEN_BUDGET = 2000
+
 
 @dataclass
 class AgentResult:
@@ -40,12 +63,14 @@ class BaseAgent(ABC):
         self.verbose = verbose
         self.tools = []
         self.knowledge_bases = []
+        self._kb_query_cache: dict[str, list[dict]] = {}
 
     def add_tool(self, tool: Any):
         self.tools.append(tool)
 
     def add_knowledge_base(self, kb: Any):
         self.knowledge_bases.append(kb)
+        self._kb_query_cache.clear()
 
     @abstractmethod
     async def analyze(self, **kwargs) -> AgentResult:
@@ -58,6 +83,15 @@ class BaseAgent(ABC):
         ])
 
     def _query_knowledge_bases(self, query: str) -> list[dict]:
+        """Search every attached knowledge base, memoized per query.
+
+        Knowledge bases are loaded once at construction, so results only
+        change when another one is attached.
+        """
+        cached = self._kb_query_cache.get(query)
+        if cached is not None:
+            return cached
+
         results = []
         for kb in self.knowledge_bases:
             entries = kb.search(query)
@@ -68,9 +102,184 @@ class BaseAgent(ABC):
                     "description": entry.description,
                     "severity": entry.severity,
                 })
+        self._kb_query_cache[query] = results
         return results
 
 
+class BatchableAgent(BaseAgent):
+    """
+    Agent whose analysis is split around a single LLM call.
+
+    The local analysis (``prepare_llm_input``) and the result building
+    (``finalize``) are separate hooks, so several of these agents can share
+    one batched LLM request through ``analyze_many``.
+    """
+
+    @abstractmethod
+    async def prepare_llm_input(self, **kwargs) -> tuple[Optional[dict], Any]:
+        """
+        Run the agent's local analysis ahead of its LLM call.
+
+        Returns the prompt inputs (None when the LLM call can be skipped) and
+        whatever state ``finalize`` needs.
+        """
+
+    @abstractmethod
+    async def finalize(self, content: str, state: Any) -> AgentResult:
+        """Build the result from the LLM reply, "" when the call was skipped."""
+
+    async def discard(self, state: Any) -> None:
+        """Release ``state`` when the LLM call failed and ``finalize`` won't run."""
+
+    async def _analyze_with_llm(self, **kwargs) -> AgentResult:
+        """Single-agent ``analyze`` built from the hooks above."""
+        try:
+            inputs, state = await self.prepare_llm_input(**kwargs)
+        except Exception as e:
+            return AgentResult(agent_name=self.name, success=False, error=str(e))
+
+        content = ""
+        if inputs is not None:
+            try:
+                chain = self.prompt | self.llm
+                response = await chain.ainvoke(inputs)
+                content = response.content
+            except Exception as e:
+                await self.discard(state)
+                return AgentResult(agent_name=self.name, success=False, error=str(e))
+
+        try:
+            return await self.finalize(content, state)
+        except Exception as e:
+            return AgentResult(agent_name=self.name, success=False, error=str(e))
+
+
+def extract_json_block(text: str) -> Optional[str]:
+    """Return the first balanced ``{...}`` object in an LLM response, or None.
+
+    A single linear scan that tracks brace depth and skips braces inside JSON
+    string literals, replacing the backtracking ``re.search(r"\{.*\}", ...,
+    re.DOTALL)`` idiom.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+_encoding = None
+
+
+def _get_encoding():
+    """Return the tiktoken encoding for the default model, or None if unavailable."""
+    global _encoding, TIKTOKEN_AVAILABLE
+    if _encoding is None and TIKTOKEN_AVAILABLE:
+        try:
+            _encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+        except Exception:
+            # Encoding files are fetched on first use; don't retry offline
+            TIKTOKEN_AVAILABLE = False
+    return _encoding
+
+
+def pack_snippets(snippets: list[str], budget: int = SNIPPET_TOKEN_BUDGET) -> list[str]:
+    """Return the leading snippets that fit in ``budget`` tokens.
+
+    Tokens are counted with tiktoken when available, otherwise estimated at
+    four characters per token. The first snippet is always kept, cut down to
+    the budget if it is larger on its own.
+    """
+    encoding = _get_encoding()
+    packed = []
+    used = 0
+    for snippet in snippets:
+        if encoding is not None:
+            tokens = encoding.encode(snippet, disallowed_special=())
+            cost = len(tokens)
+        else:
+            tokens = None
+            cost = len(snippet) // 4 + 1
+        if used + cost > budget:
+            if not packed:
+                packed.append(
+                    encoding.decode(tokens[:budget]) if tokens is not None
+                    else snippet[:budget * 4]
+                )
+            break
+        packed.append(snippet)
+        used += cost
+    return packed
+
+
+async def analyze_many(agents: list[BatchableAgent], **kwargs) -> list[AgentResult]:
+    """
+    Run several agents on the same input with one batched LLM request per model.
+
+    Local analyses run concurrently, then every prompt bound for the same LLM
+    is sent in a single ``abatch`` call. Results are returned in agent order.
+    """
+    prepared = await asyncio.gather(
+        *(agent.prepare_llm_input(**kwargs) for agent in agents),
+        return_exceptions=True,
+    )
+
+    contents = [""] * len(agents)
+    errors: dict[int, BaseException] = {}
+    by_llm: dict[int, list[int]] = {}
+    for i, item in enumerate(prepared):
+        if isinstance(item, BaseException):
+            errors[i] = item
+        elif item[0] is not None:
+            by_llm.setdefault(id(agents[i].llm), []).append(i)
+
+    async def run_batch(indexes: list[int]) -> None:
+        try:
+            prompts = [agents[i].prompt.format_prompt(**prepared[i][0]) for i in indexes]
+            responses = await agents[indexes[0]].llm.abatch(prompts, return_exceptions=True)
+        except Exception as e:
+            responses = [e] * len(indexes)
+        for i, response in zip(indexes, responses):
+            if isinstance(response, BaseException):
+                errors[i] = response
+            else:
+                contents[i] = response.content
+
+    await asyncio.gather(*(run_batch(indexes) for indexes in by_llm.values()))
+
+    results = []
+    for i, agent in enumerate(agents):
+        try:
+            if i in errors:
+                if not isinstance(prepared[i], BaseException):
+                    await agent.discard(prepared[i][1])
+                raise errors[i]
+            results.append(await agent.finalize(contents[i], prepared[i][1]))
+        except Exception as e:
+            results.append(AgentResult(agent_name=agent.name, success=False, error=str(e)))
+    return results
+
+
 def create_llm_with_structured_output(
     llm: BaseChatModel,
     schema: type,
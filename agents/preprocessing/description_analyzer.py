@@ -1,12 +1,20 @@
 import json
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Optional
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from agents.base import extract_json_block
+from core.cache import TTLCache, content_key
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 @dataclass
 class PRDescription:
@@ -28,6 +36,10 @@ class AnalyzedDescription:
 
 
 class DescriptionAnalyzer:
+    # Shared across instances: a new analyzer is created per PR run, and
+    # re-reviews of an unchanged description should not repeat the LLM call.
+    _cache = TTLCache(maxsize=256, ttl=3600)
+
     def __init__(self, llm: Optional[ChatOpenAI] = None):
         self.llm = llm or ChatOpenAI(model="gpt-4o-mini", temperature=0)
         self.prompt = ChatPromptTemplate.from_messages([
@@ -54,11 +66,11 @@ Analyze this PR and provide structured information."""),
 
     def load_from_pr_folder(self, pr_folder: str) -> PRDescription:
         metadata_path = os.path.join(pr_folder, "metadata.json")
-        if not os.path.exists(metadata_path):
-            raise FileNotFoundError(f"metadata.json not found in {pr_folder}")
-
-        with open(metadata_path, "r") as f:
-            metadata = json.load(f)
+        try:
+            with open(metadata_path, "rb") as f:
+                metadata = json_loads(f.read())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"metadata.json not found in {pr_folder}") from None
 
         return PRDescription(
             title=metadata.get("title", ""),
@@ -70,6 +82,11 @@ Analyze this PR and provide structured information."""),
         )
 
     async def analyze(self, pr_description: PRDescription) -> AnalyzedDescription:
+        cache_key = content_key(asdict(pr_description))
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         chain = self.prompt | self.llm
 
         response = await chain.ainvoke({
@@ -83,19 +100,17 @@ Analyze this PR and provide structured information."""),
 
         try:
             content = response.content
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
-                result = json.loads(content)
+            result = json.loads(extract_json_block(content) or content)
 
-            return AnalyzedDescription(
+            analyzed = AnalyzedDescription(
                 intent=result.get("intent", ""),
                 feature_areas=result.get("feature_areas", []),
                 expected_changes=result.get("expected_changes", []),
                 risk_indicators=result.get("risk_indicators", []),
                 keywords=result.get("keywords", []),
             )
+            self._cache.set(cache_key, analyzed)
+            return analyzed
         except json.JSONDecodeError:
             return self._fallback_analysis(pr_description)
 
@@ -1,8 +1,12 @@
 import re
-import json
 import os
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 
 @dataclass
@@ -36,6 +40,7 @@ class ParsedDiff:
 
 class DiffParser:
     HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+    FILE_HEADER_PATTERN = re.compile(r"diff --git a/(.+) b/(.+)")
 
     def parse_pr_folder(self, pr_folder: str) -> ParsedDiff:
         files = []
@@ -43,19 +48,23 @@ class DiffParser:
         total_deletions = 0
 
         files_changed_path = os.path.join(pr_folder, "files_changed.json")
-        if os.path.exists(files_changed_path):
-            with open(files_changed_path, "r") as f:
-                files_changed = json.load(f)
+        try:
+            with open(files_changed_path, "rb") as f:
+                files_changed = json_loads(f.read())
+        except FileNotFoundError:
+            files_changed = []
 
-            for file_info in files_changed:
-                total_additions += file_info.get("additions", 0)
-                total_deletions += file_info.get("deletions", 0)
+        for file_info in files_changed:
+            total_additions += file_info.get("additions", 0)
+            total_deletions += file_info.get("deletions", 0)
 
         diff_path = os.path.join(pr_folder, "pr.diff")
-        if os.path.exists(diff_path):
-            with open(diff_path, "r") as f:
-                diff_content = f.read()
-            files = self.parse_unified_diff(diff_content)
+        try:
+            # Text mode translates \r\n and \r, as reading the whole file did
+            with open(diff_path, "r", encoding="utf-8", errors="replace") as f:
+                files = list(self.iter_unified_diff(f))
+        except FileNotFoundError:
+            pass
 
         return ParsedDiff(
             files=files,
@@ -65,24 +74,29 @@ class DiffParser:
         )
 
     def parse_unified_diff(self, diff_text: str) -> list[FileDiff]:
-        files = []
+        return list(self.iter_unified_diff(diff_text))
+
+    def iter_unified_diff(self, diff: Union[str, Iterable[str]]) -> Iterator[FileDiff]:
+        """Yield each file's FileDiff as soon as the next file header is seen.
+
+        ``diff`` is either the full diff text or an iterable of lines, such as
+        an open file, so callers can stream a diff without reading it whole.
+        """
         current_file = None
         current_hunk = None
         new_line_num = 0
 
-        lines = diff_text.split("\n")
-        i = 0
-
-        while i < len(lines):
-            line = lines[i]
-
-            if line.startswith("diff --git"):
+        for line in self._iter_lines(diff):
+            # Every header kind starts with a distinct character, so a single
+            # peek decides which (if any) startswith() check is needed.
+            first = line[:1]
+            if first == "d" and line.startswith("diff --git"):
                 if current_file:
                     if current_hunk:
                         current_file.hunks.append(current_hunk)
-                    files.append(current_file)
+                    yield current_file
 
-                match = re.search(r"diff --git a/(.+) b/(.+)", line)
+                match = self.FILE_HEADER_PATTERN.search(line)
                 if match:
                     filename = match.group(2)
                     current_file = FileDiff(
@@ -93,15 +107,15 @@ class DiffParser:
                     )
                 current_hunk = None
 
-            elif line.startswith("--- "):
+            elif first == "-" and line.startswith("--- "):
                 if current_file and line == "--- /dev/null":
                     current_file.status = "added"
 
-            elif line.startswith("+++ "):
+            elif first == "+" and line.startswith("+++ "):
                 if current_file and line == "+++ /dev/null":
                     current_file.status = "deleted"
 
-            elif line.startswith("@@"):
+            elif first == "@" and line.startswith("@@"):
                 if current_file and current_hunk:
                     current_file.hunks.append(current_hunk)
 
@@ -122,30 +136,45 @@ class DiffParser:
                     new_line_num = new_start
 
             elif current_hunk is not None:
-                if line.startswith("+") and not line.startswith("+++"):
+                current_hunk.content += "\n" + line
+                # "+++"/"---" only need checking once the single-char test matched
+                if first == "+" and line[1:3] != "++":
                     current_hunk.added_lines.append((new_line_num, line[1:]))
-                    current_hunk.content += "\n" + line
                     if current_file:
                         current_file.additions += 1
                     new_line_num += 1
-                elif line.startswith("-") and not line.startswith("---"):
+                elif first == "-" and line[1:3] != "--":
                     current_hunk.removed_lines.append((new_line_num, line[1:]))
-                    current_hunk.content += "\n" + line
                     if current_file:
                         current_file.deletions += 1
-                else:
-                    current_hunk.content += "\n" + line
-                    if not line.startswith("\\"):
-                        new_line_num += 1
-
-            i += 1
+                elif first != "\\":
+                    new_line_num += 1
 
         if current_file:
             if current_hunk:
                 current_file.hunks.append(current_hunk)
-            files.append(current_file)
-
-        return files
+            yield current_file
+
+    @staticmethod
+    def _iter_lines(diff: Union[str, Iterable[str]]) -> Iterator[str]:
+        """Yield lines without terminators, matching ``str.split("\\n")``."""
+        if isinstance(diff, str):
+            # Lazy equivalent of diff.split("\n"): no list of every line is
+            # built alongside the original text.
+            start = 0
+            end = diff.find("\n")
+            while end != -1:
+                yield diff[start:end]
+                start = end + 1
+                end = diff.find("\n", start)
+            yield diff[start:]
+            return
+
+        line = None
+        for line in diff:
+            yield line[:-1] if line.endswith("\n") else line
+        if line is None or line.endswith("\n"):
+            yield ""
 
     def get_changed_functions(self, file_diff: FileDiff) -> list[str]:
         functions = []
@@ -7,6 +7,7 @@ from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from agents.base import extract_json_block
 from agents.preprocessing.diff_parser import ParsedDiff, FileDiff
 from agents.preprocessing.description_analyzer import AnalyzedDescription
 from output.models import FeaturePoint
@@ -68,11 +69,7 @@ Identify the distinct feature points in this PR."""),
 
         try:
             content = response.content
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
-                result = json.loads(content)
+            result = json.loads(extract_json_block(content) or content)
 
             feature_points = []
             file_to_features = {}
@@ -2,16 +2,77 @@
 import json
 import logging
 import os
-from typing import Dict, List, Any
+from collections import Counter
+from itertools import islice
+from typing import IO, Dict, Iterable, List, Any, Optional, Union
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
+from agents.base import extract_json_block
 from config import Config
+from core.cache import TTLCache, content_key
 
 logger = logging.getLogger(__name__)
 
+# Diff characters included in the summary prompt.
+_MAX_DIFF_CHARS = 5000
+
+_STATUS_ICONS = {
+    "added": "+",
+    "modified": "~",
+    "deleted": "-",
+    "renamed": "→",
+}
+
+# Fixed instructions appended after the per-PR context. Braces are doubled
+# because the text is a ChatPromptTemplate format string.
+_SUMMARY_JSON_TAIL = """请提供一个结构化的功能分析总结,使用以下JSON格式:
+
+{{
+    "overview": "用2-3句话概述这个PR的主要功能和目的",
+    "key_changes": [
+        "具体的功能变更1",
+        "具体的功能变更2",
+        ...
+    ],
+    "affected_components": [
+        "受影响的组件/模块1",
+        "受影响的组件/模块2",
+        ...
+    ],
+    "change_categories": {{
+        "feature": ["新功能或增强"],
+        "bugfix": ["缺陷修复"],
+        "refactor": ["重构或优化"],
+        "performance": ["性能改进"],
+        "documentation": ["文档更新"],
+        "tests": ["测试相关"],
+        "config": ["配置变更"],
+        "other": ["其他变更"]
+    }},
+    "complexity_assessment": "复杂度评估(低/中/高)及原因说明",
+    "testing_suggestions": [
+        "建议测试的功能点1",
+        "建议测试的功能点2",
+        ...
+    ]
+}}
+
+注意:
+1. 所有内容使用中文
+2. 只关注功能分析,不涉及安全性或脆弱性
+3. 从用户角度和业务价值角度描述变更
+4. 提供实用的测试建议
+
+只返回JSON,不要有其他文本。"""
+
 
 class PRSummaryAgent:
     """Agent to generate functional summary of PR changes."""
 
+    # LLM summaries keyed by a hash of the prepared context, shared across
+    # instances so re-reviews of unchanged PR content skip the LLM call.
+    _summary_cache = TTLCache(maxsize=128, ttl=3600)
+
     def __init__(self, llm: ChatOpenAI = None):
         """Initialize the PR summary agent.
 
@@ -19,6 +80,9 @@ class PRSummaryAgent:
             llm: Optional LLM instance. If not provided, creates default one.
         """
         self.llm = llm or self._create_default_llm()
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("human", "{context}\n\n" + _SUMMARY_JSON_TAIL),
+        ])
 
     def _create_default_llm(self) -> ChatOpenAI:
         """Create default LLM instance."""
@@ -32,12 +96,12 @@ class PRSummaryAgent:
             kwargs["base_url"] = Config.LLM_BASE_URL
         return ChatOpenAI(**kwargs)
 
-    def generate_summary(
+    async def generate_summary(
         self,
         pr_metadata: Dict[str, Any],
         files_changed: List[Dict[str, Any]],
         commits: List[Dict[str, Any]],
-        full_diff: str = None
+        full_diff: Optional[Union[str, IO[str]]] = None
     ) -> Dict[str, Any]:
         """Generate functional summary of PR changes.
 
@@ -45,7 +109,7 @@ class PRSummaryAgent:
             pr_metadata: PR metadata from GitHub API
             files_changed: List of changed files
             commits: List of commits with messages
-            full_diff: Optional full diff text
+            full_diff: Optional full diff text, or an open file to read its head from
 
         Returns:
             Dictionary containing functional summary with keys:
@@ -61,7 +125,9 @@ class PRSummaryAgent:
         )
 
         # Generate summary using LLM
-        summary = self._generate_summary_with_llm(context)
+        summary = await self._generate_summary_with_llm(context)
+
+        status_counts = Counter(f.get("status", "") for f in files_changed)
 
         return {
             "overview": summary.get("overview", ""),
@@ -72,10 +138,10 @@ class PRSummaryAgent:
             "testing_suggestions": summary.get("testing_suggestions", []),
             "files_summary": {
                 "total_files": len(files_changed),
-                "added": sum(1 for f in files_changed if f.get("status") == "added"),
-                "modified": sum(1 for f in files_changed if f.get("status") == "modified"),
-                "deleted": sum(1 for f in files_changed if f.get("status") == "deleted"),
-                "renamed": sum(1 for f in files_changed if f.get("status") == "renamed"),
+                "added": status_counts["added"],
+                "modified": status_counts["modified"],
+                "deleted": status_counts["deleted"],
+                "renamed": status_counts["renamed"],
             },
             "commits_summary": {
                 "total_commits": len(commits),
@@ -86,51 +152,54 @@ class PRSummaryAgent:
     def _prepare_summary_context(
         self,
         pr_metadata: Dict[str, Any],
-        files_changed: List[Dict[str, Any]],
-        commits: List[Dict[str, Any]],
-        full_diff: str = None
+        files_changed: Iterable[Dict[str, Any]],
+        commits: Iterable[Dict[str, Any]],
+        full_diff: Optional[Union[str, IO[str]]] = None
     ) -> str:
-        """Prepare context text for LLM summary generation."""
+        """Prepare context text for LLM summary generation.
+
+        ``full_diff`` may be an open text file, in which case only the first
+        ``_MAX_DIFF_CHARS`` characters are read instead of the whole diff.
+        """
+        meta = pr_metadata.get
         context_parts = [
             f"# Pull Request 功能分析请求\n",
-            f"## PR 标题: {pr_metadata.get('title', 'N/A')}",
-            f"## PR 描述:\n{pr_metadata.get('body', '无描述')}\n",
-            f"## 作者: {pr_metadata.get('author', 'Unknown')}",
-            f"## 目标分支: {pr_metadata.get('base_branch', 'main')}",
-            f"## 源分支: {pr_metadata.get('head_branch', 'unknown')}",
-            f"## 变更统计: +{pr_metadata.get('additions', 0)} -{pr_metadata.get('deletions', 0)} 行\n",
+            f"## PR 标题: {meta('title', 'N/A')}",
+            f"## PR 描述:\n{meta('body', '无描述')}\n",
+            f"## 作者: {meta('author', 'Unknown')}",
+            f"## 目标分支: {meta('base_branch', 'main')}",
+            f"## 源分支: {meta('head_branch', 'unknown')}",
+            f"## 变更统计: +{meta('additions', 0)} -{meta('deletions', 0)} 行\n",
         ]
 
         # Files changed
         context_parts.append("## 修改文件:")
-        for file in files_changed[:20]:  # Limit to first 20 files
-            status_icon = {
-                "added": "+",
-                "modified": "~",
-                "deleted": "-",
-                "renamed": "→"
-            }.get(file.get("status", ""), "?")
-            context_parts.append(
-                f"{status_icon} {file.get('filename', 'unknown')} "
-                f"(+{file.get('additions', 0)} -{file.get('deletions', 0)})"
+        append = context_parts.append
+        for file in islice(files_changed, 20):  # Limit to first 20 files
+            get = file.get
+            status_icon = _STATUS_ICONS.get(get("status", ""), "?")
+            append(
+                f"{status_icon} {get('filename', 'unknown')} "
+                f"(+{get('additions', 0)} -{get('deletions', 0)})"
             )
 
         # Commit messages
-        context_parts.append("\n## 提交记录:")
-        for commit in commits[:10]:  # Limit to first 10 commits
-            msg = commit.get("message", "").split("\n")[0]  # First line only
-            sha = commit.get("sha", "")[:8]
-            context_parts.append(f"- {sha}: {msg}")
+        append("\n## 提交记录:")
+        for commit in islice(commits, 10):  # Limit to first 10 commits
+            get = commit.get
+            msg = get("message", "").partition("\n")[0]  # First line only
+            sha = get("sha", "")[:8]
+            append(f"- {sha}: {msg}")
 
         # Add truncated diff if available (limit to 5000 chars)
-        if full_diff and len(full_diff) > 0:
-            truncated_diff = full_diff[:5000]
-            if len(full_diff) > 5000:
+        truncated_diff, more = self._read_diff_head(full_diff)
+        if truncated_diff:
+            if more:
                 truncated_diff += "\n... (已截断)"
-            context_parts.append(f"\n## 代码差异 (前5000字符):\n{truncated_diff}")
+            append(f"\n## 代码差异 (前{_MAX_DIFF_CHARS}字符):\n{truncated_diff}")
 
-        context_parts.append("\n" + "="*80)
-        context_parts.append(
+        append("\n" + "="*80)
+        append(
             "基于以上信息,请提供此PR的**功能分析总结**。"
             "重点关注:修改了什么功能、为什么修改、影响了哪些模块。"
             "不要关注安全性或脆弱性分析,仅从功能角度分析。"
@@ -138,62 +207,33 @@ class PRSummaryAgent:
 
         return "\n".join(context_parts)
 
-    def _generate_summary_with_llm(self, context: str) -> Dict[str, Any]:
-        """Generate summary using LLM."""
-        prompt = f"""{context}
-
-请提供一个结构化的功能分析总结,使用以下JSON格式:
-
-{{
-    "overview": "用2-3句话概述这个PR的主要功能和目的",
-    "key_changes": [
-        "具体的功能变更1",
-        "具体的功能变更2",
-        ...
-    ],
-    "affected_components": [
-        "受影响的组件/模块1",
-        "受影响的组件/模块2",
-        ...
-    ],
-    "change_categories": {{
-        "feature": ["新功能或增强"],
-        "bugfix": ["缺陷修复"],
-        "refactor": ["重构或优化"],
-        "performance": ["性能改进"],
-        "documentation": ["文档更新"],
-        "tests": ["测试相关"],
-        "config": ["配置变更"],
-        "other": ["其他变更"]
-    }},
-    "complexity_assessment": "复杂度评估(低/中/高)及原因说明",
-    "testing_suggestions": [
-        "建议测试的功能点1",
-        "建议测试的功能点2",
-        ...
-    ]
-}}
-
-注意:
-1. 所有内容使用中文
-2. 只关注功能分析,不涉及安全性或脆弱性
-3. 从用户角度和业务价值角度描述变更
-4. 提供实用的测试建议
+    @staticmethod
+    def _read_diff_head(full_diff: Optional[Union[str, IO[str]]]) -> tuple[str, bool]:
+        """Return the first ``_MAX_DIFF_CHARS`` of the diff and whether more follows."""
+        if not full_diff:
+            return "", False
+        if isinstance(full_diff, str):
+            return full_diff[:_MAX_DIFF_CHARS], len(full_diff) > _MAX_DIFF_CHARS
+        head = full_diff.read(_MAX_DIFF_CHARS)
+        return head, bool(full_diff.read(1))
 
-只返回JSON,不要有其他文本。"""
+    async def _generate_summary_with_llm(self, context: str) -> Dict[str, Any]:
+        """Generate summary using LLM."""
+        cache_key = content_key(context)
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached PR functional summary")
+            return cached
 
         try:
-            response = self.llm.invoke(prompt)
+            chain = self.prompt | self.llm
+            response = await chain.ainvoke({"context": context})
             response_text = response.content.strip()
 
-            # Extract JSON from response
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            summary = json.loads(response_text)
+            # Extract JSON from response (handles ```json fences and stray prose)
+            summary = json.loads(extract_json_block(response_text) or response_text)
             logger.info("Successfully generated PR functional summary")
+            self._summary_cache.set(cache_key, summary)
             return summary
 
         except Exception as e:
@@ -1,20 +1,228 @@
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import re
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Optional
 
 from langchain_openai import ChatOpenAI
 
-from agents.base import BaseAgent, AgentResult
+from agents.base import BatchableAgent, AgentResult, extract_json_block, pack_snippets, prompt_json
+from core.cache import TTLCache
+from core.file_index import FileIndex
 from knowledge.best_practices_kb import BestPracticesKB
 from tools.linter import LinterTool
-from output.models import Bug, BugType, Severity, MemoryAnalysis
+from output.models import Bug, BugType, Severity, MemoryAnalysis, bugs_to_dicts
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# (pattern, message, bug type, severity) checks run on every source line.
+# Patterns are bytes so files are scanned without decoding them first.
+MEMORY_PATTERNS = [
+    (re.compile(rb"open\s*\([^)]+\)(?!\s*as\s)"), "File opened without context manager", BugType.MEMORY_ISSUE, Severity.MEDIUM),
+    (re.compile(rb"\.connect\s*\([^)]+\)(?!\s*as\s)"), "Connection opened without context manager", BugType.MEMORY_ISSUE, Severity.MEDIUM),
+    (re.compile(rb"global\s+\w+"), "Global variable usage detected", BugType.STYLE_VIOLATION, Severity.LOW),
+    (re.compile(rb"\bself\.\w+\s*=\s*\[\].*#.*cache"), "Potential unbounded cache", BugType.MEMORY_ISSUE, Severity.MEDIUM),
+]
+
+# Lines worth showing the LLM as resource-management context
+RELEVANT_CODE_PATTERNS = [
+    rb"open\s*\(",
+    rb"connect\s*\(",
+    rb"with\s+",
+    rb"global\s+",
+    rb"__del__",
+    rb"\.close\s*\(",
+]
+
+NO_RELEVANT_CODE = "No relevant patterns found in code"
+
+# Unions of each pattern set: most lines match none, so one scan rules them out
+_MEMORY_ANY = re.compile(b"|".join(b"(?:" + p.pattern + b")" for p, _, _, _ in MEMORY_PATTERNS))
+_RELEVANT_CODE_ANY = re.compile(b"|".join(RELEVANT_CODE_PATTERNS))
+
+# Literals every match of the corresponding set contains, checked with a
+# plain substring search before any regex work
+_MEMORY_TRIGGERS = (b"open", b".connect", b"global", b"[]")
+_RELEVANT_CODE_TRIGGERS = (b"open", b"connect", b"with", b"global", b"__del__", b".close")
+
+
+def _compile_prefilter_db(patterns: list[bytes]):
+    """Compile patterns into one Hyperscan database for whole-file scanning.
+
+    Prefilter mode accepts constructs Hyperscan can't match exactly (the
+    lookaheads above) at the cost of possible false positives, so hits are
+    confirmed with ``re`` afterwards.
+    """
+    db = hyperscan.Database()
+    db.compile(
+        expressions=list(patterns),
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        flags=[hyperscan.HS_FLAG_PREFILTER] * len(patterns),
+    )
+    return db
+
+
+_MEMORY_DB = None
+_RELEVANT_CODE_DB = None
+if HYPERSCAN_AVAILABLE:
+    try:
+        _MEMORY_DB = _compile_prefilter_db([p.pattern for p, _, _, _ in MEMORY_PATTERNS])
+        _RELEVANT_CODE_DB = _compile_prefilter_db(RELEVANT_CODE_PATTERNS)
+    except Exception:
+        _MEMORY_DB = _RELEVANT_CODE_DB = None
+
+# Hyperscan scratch space can't be shared by concurrent scans: one per
+# thread and database
+_scan_state = threading.local()
+
+
+def _thread_scratch(db):
+    scratches = getattr(_scan_state, "scratches", None)
+    if scratches is None:
+        scratches = _scan_state.scratches = {}
+    scratch = scratches.get(id(db))
+    if scratch is None:
+        scratch = scratches[id(db)] = hyperscan.Scratch(db)
+    return scratch
+
+
+def _read_matching_lines(
+    filepath: str,
+    any_pattern: re.Pattern,
+    triggers: tuple[bytes, ...],
+    hs_db=None,
+) -> tuple[list[bytes], list[int]]:
+    """Return a file's raw lines and the indexes of lines matching ``any_pattern``.
+
+    Lines are split on the same boundaries as universal-newline text mode
+    and keep their endings. With a Hyperscan database the whole file is
+    scanned in one call and only the reported candidate lines are checked
+    in Python. A file containing none of ``triggers`` can't match and is
+    rejected without running either; files without candidates are never
+    split and yield no lines.
+    """
+    data = FileIndex.read(filepath)
+    if not any(trigger in data for trigger in triggers):
+        return [], []
+
+    if hs_db is None:
+        lines = data.splitlines(keepends=True)
+        search = any_pattern.search
+        return lines, [i for i, line in enumerate(lines) if search(line)]
+
+    ends = []
+
+    def on_match(_id, _start, end, _flags, _context):
+        ends.append(end)
+
+    # Most files have no candidates at all: skip splitting those into lines
+    hs_db.scan(data, match_event_handler=on_match, scratch=_thread_scratch(hs_db))
+    if not ends:
+        return [], []
+
+    lines = data.splitlines(keepends=True)
+
+    # Map match end offsets to line indexes in one pass
+    if NUMPY_AVAILABLE:
+        line_ends = np.cumsum(np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)))
+        hit_lines = np.searchsorted(line_ends, np.array(ends, dtype=np.int64) - 1, side="right")
+        candidates = np.unique(hit_lines).tolist()
+    else:
+        line_ends = list(accumulate(map(len, lines)))
+        candidates = sorted({bisect_right(line_ends, end - 1) for end in ends})
+
+    return lines, [i for i in candidates if any_pattern.search(lines[i])]
+
+
+def _decode_line(line: bytes) -> str:
+    """Decode a raw line, normalizing its ending to ``\\n`` as text mode would."""
+    text = line.decode("utf-8", "replace")
+    stripped = text.rstrip("\r\n")
+    return stripped + "\n" if len(stripped) != len(text) else text
+
+
+# Below this many files, handing the scan to worker processes costs more than it saves
+PARALLEL_SCAN_MIN_FILES = 64
+
+_scan_pool: Optional[ProcessPoolExecutor] = None
+_scan_pool_lock = threading.Lock()
+
+
+def _get_scan_pool() -> ProcessPoolExecutor:
+    """The worker pool for large scans, started once and reused.
+
+    Workers come from a forkserver: forking this multi-threaded process
+    directly could hand them locks (caches, logging) held by other threads.
+    """
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is None:
+            _scan_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _scan_pool
+
+
+def _reset_scan_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (e.g. a killed worker) so the next large scan starts a new one."""
+    global _scan_pool
+    with _scan_pool_lock:
+        if _scan_pool is pool:
+            _scan_pool = None
+    pool.shutdown(wait=False)
+
+
+def _scan_file(filepath: str) -> Optional[list[tuple[int, int, str]]]:
+    """Return (line number, MEMORY_PATTERNS index, matched text) for each hit in a file.
 
+    Module-level and returning plain tuples so it can run in worker processes
+    cheaply; the parent builds the Bug models. None if the file couldn't be
+    scanned, so a failure isn't mistaken for (and cached as) a clean file.
+    """
+    try:
+        lines, hits = _read_matching_lines(filepath, _MEMORY_ANY, _MEMORY_TRIGGERS, _MEMORY_DB)
+    except Exception:
+        return None
 
-class MemoryAnalysisAgent(BaseAgent):
+    found = []
+    for i in hits:
+        line = lines[i]
+        for index, (pattern, _, _, _) in enumerate(MEMORY_PATTERNS):
+            if pattern.search(line):
+                found.append((i + 1, index, line.decode("utf-8", "replace").strip()[:50]))
+    return found
+
+
+class MemoryAnalysisAgent(BatchableAgent):
     name = "memory_analysis_agent"
     description = "Analyzes code context, variable lifecycle, and memory patterns"
 
+    _scan_cache = TTLCache(maxsize=4096, ttl=None)
+
     def __init__(
         self,
         llm: Optional[ChatOpenAI] = None,
@@ -53,7 +261,10 @@ Respond in JSON format:
     "summary": "overall assessment",
     "patterns_found": ["list of patterns detected"]
 }}""",
-            human_message="""Analyze the following code for memory and context issues:
+            human_message="""Best practices reference:
+{best_practices}
+
+Analyze the following code for memory and context issues:
 
 Changed files:
 {files_info}
@@ -61,9 +272,6 @@ Changed files:
 Code snippets:
 {code_snippets}
 
-Best practices reference:
-{best_practices}
-
 Provide your memory and context analysis.""",
         )
 
@@ -73,119 +281,141 @@ Provide your memory and context analysis.""",
         changed_files: list[str] = None,
         **kwargs,
     ) -> AgentResult:
-        try:
-            if changed_files:
-                files_to_analyze = [
-                    os.path.join(codebase_path, f) for f in changed_files
-                    if os.path.exists(os.path.join(codebase_path, f))
-                ]
-            else:
-                files_to_analyze = self._get_source_files(codebase_path)
+        return await self._analyze_with_llm(
+            codebase_path=codebase_path, changed_files=changed_files, **kwargs
+        )
 
-            best_practices = self._query_knowledge_bases("resource management context memory")
+    async def prepare_llm_input(
+        self,
+        codebase_path: str,
+        changed_files: list[str] = None,
+        **kwargs,
+    ) -> tuple[Optional[dict], asyncio.Future]:
+        if changed_files:
+            files_to_analyze = [
+                os.path.join(codebase_path, f) for f in changed_files
+                if os.path.exists(os.path.join(codebase_path, f))
+            ]
+        else:
+            files_to_analyze = self._get_source_files(codebase_path)
 
-            code_snippets = self._extract_relevant_code(files_to_analyze[:5])
+        best_practices = self._query_knowledge_bases("resource management context memory")
 
-            basic_issues = self._run_basic_memory_analysis(files_to_analyze)
+        code_snippets = self._extract_relevant_code(files_to_analyze[:5])
 
-            files_info = "\n".join([f"- {f}" for f in files_to_analyze[:20]])
+        files_info = "\n".join([f"- {f}" for f in files_to_analyze[:20]])
 
-            chain = self.prompt | self.llm
-            response = await chain.ainvoke({
-                "files_info": files_info,
-                "code_snippets": code_snippets,
-                "best_practices": json.dumps(best_practices[:5], indent=2),
-            })
+        # The prompt doesn't depend on the full-scan results, so the scan
+        # runs in the background while the LLM call is in flight
+        scan = asyncio.ensure_future(
+            asyncio.to_thread(self._run_basic_memory_analysis, files_to_analyze)
+        )
 
-            result = self._parse_response(response.content, basic_issues)
+        if code_snippets == NO_RELEVANT_CODE:
+            # Nothing resource-related for the LLM to look at: the local
+            # scan is the whole answer
+            return None, scan
 
-            return AgentResult(
-                agent_name=self.name,
-                success=True,
-                issues=[self._bug_to_dict(bug) for bug in result.issues],
-                summary=result.summary,
-                metrics={"patterns_found": result.patterns_found},
-            )
+        return {
+            "files_info": files_info,
+            "code_snippets": code_snippets,
+            "best_practices": prompt_json(best_practices[:5]),
+        }, scan
+
+    async def finalize(self, content: str, scan: asyncio.Future) -> AgentResult:
+        basic_issues = await scan
+        result = self._parse_response(content, basic_issues)
+
+        return AgentResult(
+            agent_name=self.name,
+            success=True,
+            issues=bugs_to_dicts(result.issues),
+            summary=result.summary,
+            metrics={"patterns_found": result.patterns_found},
+        )
 
-        except Exception as e:
-            return AgentResult(
-                agent_name=self.name,
-                success=False,
-                error=str(e),
-            )
+    async def discard(self, scan: asyncio.Future) -> None:
+        scan.cancel()
+        # Retrieve the outcome so a scan that already failed isn't logged as unhandled
+        await asyncio.gather(scan, return_exceptions=True)
 
     def _get_source_files(self, path: str) -> list[str]:
-        source_files = []
-        extensions = {".py", ".js", ".ts", ".java", ".go"}
-        for root, _, files in os.walk(path):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    source_files.append(os.path.join(root, file))
-        return source_files
+        return FileIndex.get(path, {".py", ".js", ".ts", ".java", ".go"})
 
     def _extract_relevant_code(self, files: list[str]) -> str:
         snippets = []
-        patterns_to_find = [
-            r"open\s*\(",
-            r"connect\s*\(",
-            r"with\s+",
-            r"global\s+",
-            r"__del__",
-            r"\.close\s*\(",
-        ]
 
         for filepath in files:
             try:
-                with open(filepath, "r") as f:
-                    lines = f.readlines()
+                if FileIndex.read_source(filepath) is None:
+                    continue
+                lines, hits = _read_matching_lines(
+                    filepath, _RELEVANT_CODE_ANY, _RELEVANT_CODE_TRIGGERS, _RELEVANT_CODE_DB
+                )
 
                 relevant_lines = []
-                for i, line in enumerate(lines):
-                    for pattern in patterns_to_find:
-                        if re.search(pattern, line):
-                            start = max(0, i - 2)
-                            end = min(len(lines), i + 3)
-                            context = lines[start:end]
-                            relevant_lines.append(f"Lines {start+1}-{end}:\n{''.join(context)}")
-                            break
+                for i in hits:
+                    start = max(0, i - 2)
+                    end = min(len(lines), i + 3)
+                    context = "".join(map(_decode_line, lines[start:end]))
+                    relevant_lines.append(f"Lines {start+1}-{end}:\n{context}")
 
                 if relevant_lines:
-                    snippets.append(f"=== {filepath} ===\n" + "\n".join(relevant_lines[:3]))
+                    snippets.append((len(hits), f"=== {filepath} ===\n" + "\n".join(relevant_lines[:3])))
 
             except Exception:
                 pass
 
-        return "\n\n".join(snippets[:5]) or "No relevant patterns found in code"
+        # Files with the most resource-handling lines first, then cut to the budget
+        snippets.sort(key=lambda s: s[0], reverse=True)
+        return "\n\n".join(pack_snippets([s for _, s in snippets[:5]])) or NO_RELEVANT_CODE
 
     def _run_basic_memory_analysis(self, files: list[str]) -> list[Bug]:
         issues = []
 
-        memory_patterns = [
-            (r"open\s*\([^)]+\)(?!\s*as\s)", "File opened without context manager", BugType.MEMORY_ISSUE, Severity.MEDIUM),
-            (r"\.connect\s*\([^)]+\)(?!\s*as\s)", "Connection opened without context manager", BugType.MEMORY_ISSUE, Severity.MEDIUM),
-            (r"global\s+\w+", "Global variable usage detected", BugType.STYLE_VIOLATION, Severity.LOW),
-            (r"\bself\.\w+\s*=\s*\[\].*#.*cache", "Potential unbounded cache", BugType.MEMORY_ISSUE, Severity.MEDIUM),
-        ]
-
+        # Hits don't depend on the path, so files whose content was already
+        # scanned (re-runs, copies) reuse the earlier result
+        results = {}
+        misses = {}
         for filepath in files:
             try:
-                with open(filepath, "r") as f:
-                    lines = f.readlines()
-
-                for line_num, line in enumerate(lines, 1):
-                    for pattern, message, bug_type, severity in memory_patterns:
-                        if re.search(pattern, line):
-                            issues.append(Bug(
-                                id=f"mem-{filepath}-{line_num}",
-                                type=bug_type,
-                                severity=severity,
-                                title=message,
-                                description=f"Found pattern: {line.strip()[:50]}",
-                                file=filepath,
-                                line=line_num,
-                            ))
-            except Exception:
-                pass
+                key = hashlib.blake2b(FileIndex.read(filepath), digest_size=16).digest()
+            except OSError:
+                continue
+            cached = self._scan_cache.get(key)
+            if cached is None:
+                misses[filepath] = key
+            else:
+                results[filepath] = cached
+
+        scanned = None
+        if len(misses) >= PARALLEL_SCAN_MIN_FILES:
+            pool = _get_scan_pool()
+            try:
+                scanned = list(pool.map(_scan_file, misses, chunksize=32))
+            except BrokenProcessPool:
+                _reset_scan_pool(pool)
+        if scanned is None:
+            scanned = map(_scan_file, misses)
+
+        for (filepath, key), hits in zip(misses.items(), scanned):
+            if hits is None:
+                continue
+            self._scan_cache.set(key, hits)
+            results[filepath] = hits
+
+        for filepath in files:
+            for line_num, index, text in results.get(filepath, ()):
+                _, message, bug_type, severity = MEMORY_PATTERNS[index]
+                issues.append(Bug(
+                    id=f"mem-{filepath}-{line_num}",
+                    type=bug_type,
+                    severity=severity,
+                    title=message,
+                    description=f"Found pattern: {text}",
+                    file=filepath,
+                    line=line_num,
+                ))
 
         return issues
 
@@ -194,13 +424,19 @@ Provide your memory and context analysis.""",
         patterns_found = []
 
         try:
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
-                result = json.loads(content)
+            result = json_loads(extract_json_block(content) or content)
 
+            # The LLM often repeats what the local scan already reported
+            seen = {(bug.file, bug.line, bug.title.lower()) for bug in issues}
             for issue_data in result.get("issues", []):
+                key = (
+                    issue_data.get("file", ""),
+                    issue_data.get("line", 0),
+                    issue_data.get("title", "").lower(),
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
                 issues.append(Bug(
                     id=f"mem-llm-{len(issues)}",
                     type=BugType.MEMORY_ISSUE,
@@ -234,14 +470,3 @@ Provide your memory and context analysis.""",
             "critical": Severity.CRITICAL,
         }
         return mapping.get(severity.lower(), Severity.LOW)
-
-    def _bug_to_dict(self, bug: Bug) -> dict:
-        return {
-            "id": bug.id,
-            "type": bug.type.value,
-            "severity": bug.severity.value,
-            "title": bug.title,
-            "description": bug.description,
-            "file": bug.file,
-            "line": bug.line,
-        }
@@ -1,14 +1,20 @@
+import asyncio
 import json
-import re
 import os
 from typing import Optional
 
 from langchain_core.language_models import BaseChatModel
 
-from agents.base import BaseAgent, AgentResult
+from agents.base import BatchableAgent, AgentResult, extract_json_block, pack_snippets, prompt_json
+from core.file_index import FileIndex
 from knowledge.code_patterns_kb import CodePatternsKB
 from tools.linter import LinterTool
-from output.models import Bug, BugType, Severity, StructureAnalysis
+from output.models import Bug, BugType, Severity, StructureAnalysis, bugs_to_dicts
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 LANG_EXTENSIONS = {
     "python": [".py"],
@@ -17,9 +23,10 @@ LANG_EXTENSIONS = {
     "ruby": [".rb"],
     "typescript": [".ts", ".tsx", ".js", ".jsx"],
 }
+EXT_TO_LANG = {ext: lang for lang, exts in LANG_EXTENSIONS.items() for ext in exts}
 
 
-class SyntaxStructureAgent(BaseAgent):
+class SyntaxStructureAgent(BatchableAgent):
     name = "syntax_structure_agent"
     description = "Analyzes code structure, AST, and syntax correctness"
 
@@ -64,7 +71,10 @@ Respond in JSON format:
         "complexity_score": number
     }}
 }}""",
-            human_message="""Analyze the following code structure:
+            human_message="""Relevant patterns from knowledge base:
+{kb_patterns}
+
+Analyze the following code structure:
 
 Files changed:
 {files_info}
@@ -72,9 +82,6 @@ Files changed:
 Linter results:
 {linter_results}
 
-Relevant patterns from knowledge base:
-{kb_patterns}
-
 Code snippets:
 {code_snippets}
 
@@ -87,88 +94,97 @@ Provide your structural analysis.""",
         changed_files: list[str] = None,
         **kwargs,
     ) -> AgentResult:
-        try:
-            if changed_files:
-                files_to_analyze = [
-                    os.path.join(codebase_path, f) for f in changed_files
-                    if os.path.exists(os.path.join(codebase_path, f))
-                ]
-            else:
-                files_to_analyze = self._get_source_files(codebase_path)
-
-            files_by_lang = self._group_by_language(files_to_analyze)
-
-            linter_issues = []
-            for lang, files in files_by_lang.items():
-                if files:
-                    result = await self.linter.run_on_files(files, language=lang)
-                    if result.success and result.issues:
-                        linter_issues.extend(result.issues)
-
-            kb_patterns = self._query_knowledge_bases("structure complexity nesting")
-
-            code_snippets = self._extract_code_snippets(files_to_analyze[:5])
-
-            files_info = "\n".join([f"- {f}" for f in files_to_analyze[:20]])
-            if len(files_to_analyze) > 20:
-                files_info += f"\n... and {len(files_to_analyze) - 20} more files"
-
-            chain = self.prompt | self.llm
-            response = await chain.ainvoke({
-                "files_info": files_info,
-                "linter_results": json.dumps(linter_issues[:20], indent=2),
-                "kb_patterns": json.dumps(kb_patterns[:5], indent=2),
-                "code_snippets": code_snippets,
-            })
-
-            result = self._parse_response(response.content, linter_issues)
-
-            return AgentResult(
-                agent_name=self.name,
-                success=True,
-                issues=[self._bug_to_dict(bug) for bug in result.issues],
-                summary=result.summary,
-                metrics=result.metrics,
-            )
+        return await self._analyze_with_llm(
+            codebase_path=codebase_path, changed_files=changed_files, **kwargs
+        )
 
-        except Exception as e:
-            return AgentResult(
-                agent_name=self.name,
-                success=False,
-                error=str(e),
-            )
+    async def prepare_llm_input(
+        self,
+        codebase_path: str,
+        changed_files: list[str] = None,
+        **kwargs,
+    ) -> tuple[Optional[dict], list[dict]]:
+        if changed_files:
+            files_to_analyze = [
+                os.path.join(codebase_path, f) for f in changed_files
+                if os.path.exists(os.path.join(codebase_path, f))
+            ]
+        else:
+            files_to_analyze = self._get_source_files(codebase_path)
+
+        files_by_lang = self._group_by_language(files_to_analyze)
+
+        # Snippet reads overlap the linter subprocesses; the prompt needs both
+        lint_results, code_snippets = await asyncio.gather(
+            asyncio.gather(
+                *(
+                    self.linter.run_on_files(files, language=lang)
+                    for lang, files in files_by_lang.items()
+                    if files
+                ),
+                return_exceptions=True,
+            ),
+            asyncio.to_thread(self._extract_code_snippets, files_to_analyze[:5]),
+        )
+
+        linter_issues = []
+        for result in lint_results:
+            if not isinstance(result, Exception) and result.success and result.issues:
+                linter_issues.extend(result.issues)
+
+        if not files_to_analyze:
+            # No source files: nothing for the LLM to review
+            return None, linter_issues
+
+        kb_patterns = self._query_knowledge_bases("structure complexity nesting")
+
+        files_info = "\n".join([f"- {f}" for f in files_to_analyze[:20]])
+        if len(files_to_analyze) > 20:
+            files_info += f"\n... and {len(files_to_analyze) - 20} more files"
+
+        return {
+            "files_info": files_info,
+            "linter_results": prompt_json(linter_issues[:20]),
+            "kb_patterns": prompt_json(kb_patterns[:5]),
+            "code_snippets": code_snippets,
+        }, linter_issues
+
+    async def finalize(self, content: str, linter_issues: list[dict]) -> AgentResult:
+        result = self._parse_response(content, linter_issues)
+
+        return AgentResult(
+            agent_name=self.name,
+            success=True,
+            issues=bugs_to_dicts(result.issues),
+            summary=result.summary,
+            metrics=result.metrics,
+        )
 
     def _group_by_language(self, files: list[str]) -> dict[str, list[str]]:
         """Group files by their detected language."""
         result = {lang: [] for lang in LANG_EXTENSIONS}
         for filepath in files:
-            ext = os.path.splitext(filepath)[1].lower()
-            for lang, extensions in LANG_EXTENSIONS.items():
-                if ext in extensions:
-                    result[lang].append(filepath)
-                    break
+            lang = EXT_TO_LANG.get(os.path.splitext(filepath)[1].lower())
+            if lang:
+                result[lang].append(filepath)
         return result
 
     def _get_source_files(self, path: str) -> list[str]:
-        source_files = []
-        extensions = {".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rb"}
-        for root, _, files in os.walk(path):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    source_files.append(os.path.join(root, file))
-        return source_files
+        return FileIndex.get(path, {".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go", ".rb"})
 
     def _extract_code_snippets(self, files: list[str], max_lines: int = 50) -> str:
         snippets = []
         for filepath in files:
             try:
-                with open(filepath, "r") as f:
-                    content = f.read()
-                    lines = content.split("\n")[:max_lines]
-                    snippets.append(f"=== {filepath} ===\n" + "\n".join(lines))
+                data = FileIndex.read_source(filepath)
+                if data is None:
+                    continue
+                content = data.decode("utf-8")
+                lines = content.split("\n")[:max_lines]
+                snippets.append(f"=== {filepath} ===\n" + "\n".join(lines))
             except Exception:
                 pass
-        return "\n\n".join(snippets[:3])
+        return "\n\n".join(pack_snippets(snippets[:3]))
 
     def _parse_response(self, content: str, linter_issues: list[dict]) -> StructureAnalysis:
         issues = []
@@ -186,13 +202,19 @@ Provide your structural analysis.""",
                 ))
 
         try:
-            json_match = re.search(r"\{.*\}", content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-            else:
-                result = json.loads(content)
+            result = json_loads(extract_json_block(content) or content)
 
+            # The LLM often repeats what the linters already reported
+            seen = {(bug.file, bug.line, bug.title.lower()) for bug in issues}
             for issue_data in result.get("issues", []):
+                key = (
+                    issue_data.get("file", ""),
+                    issue_data.get("line", 0),
+                    issue_data.get("title", "").lower(),
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
                 issues.append(Bug(
                     id=f"struct-{len(issues)}",
                     type=BugType.SYNTAX_ERROR if issue_data.get("type") == "syntax_error" else BugType.STYLE_VIOLATION,
@@ -224,14 +246,3 @@ Provide your structural analysis.""",
             "critical": Severity.CRITICAL,
         }
         return mapping.get(severity.lower(), Severity.LOW)
-
-    def _bug_to_dict(self, bug: Bug) -> dict:
-        return {
-            "id": bug.id,
-            "type": bug.type.value,
-            "severity": bug.severity.value,
-            "title": bug.title,
-            "description": bug.description,
-            "file": bug.file,
-            "line": bug.line,
-        }
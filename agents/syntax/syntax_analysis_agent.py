@@ -12,6 +12,7 @@ Based on 2025 LangChain best practices:
 - @tool decorator for tool integration
 """
 
+import asyncio
 import os
 import logging
 from typing import Annotated, TypedDict, Any
@@ -103,9 +104,14 @@ def create_lint_node(linter: LinterTool):
         
         logger.info(f"Linting {len(full_paths)} files across {len(languages)} languages")
         
+        # One linter subprocess per language, all running at once
+        results = await asyncio.gather(*(
+            linter.run_on_files(lang_files, language=lang)
+            for lang, lang_files in files_by_lang.items()
+        ))
+
         all_issues = []
-        for lang, lang_files in files_by_lang.items():
-            result = await linter.run_on_files(lang_files, language=lang)
+        for lang, result in zip(languages, results):
             if result.success and result.issues:
                 for issue in result.issues:
                     issue["language"] = lang
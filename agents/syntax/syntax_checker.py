@@ -8,12 +8,32 @@ pure syntax/style checking.
 Enhanced with memory/resource leak detection capabilities.
 """
 
+import asyncio
+import hashlib
+import json
+import math
+import operator
 import os
+import sys
 import logging
+import tempfile
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, TextIO
 
-from tools.linter import LinterTool, LinterConfig
+from config import Config
+from core.file_index import FileIndex
+from tools.base import ToolResult
+
+if TYPE_CHECKING:
+    from tools.linter import LinterTool
+
+try:
+    from xxhash import xxh3_128 as _content_hash
+except ImportError:
+    def _content_hash(data: bytes = b""):
+        return hashlib.blake2b(data, digest_size=16)
 
 logger = logging.getLogger(__name__)
 
@@ -24,15 +44,44 @@ LANG_EXTENSIONS = {
     "ruby": [".rb"],
     "typescript": [".ts", ".tsx", ".js", ".jsx"],
 }
+EXT_TO_LANG = {ext: lang for lang, exts in LANG_EXTENSIONS.items() for ext in exts}
+
+# Linters whose findings for a file depend only on that file's content, so
+# results can be cached per file (golangci-lint and checkstyle look across
+# packages)
+CACHEABLE_LINTERS = {"ruff", "eslint", "rubocop"}
+
+# Project files the cacheable linters read settings from. Any of them in a
+# file's directory or above it, up to the codebase root, can change that
+# file's findings, so they are part of its cache key.
+LINTER_CONFIG_FILES = {
+    "ruff": ("pyproject.toml", "ruff.toml", ".ruff.toml"),
+    "eslint": (
+        "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs",
+        ".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json",
+        ".eslintrc.yml", ".eslintrc.yaml", ".eslintignore", "package.json",
+    ),
+    "rubocop": (".rubocop.yml", ".rubocop_todo.yml"),
+}
+
+# golangci-lint type-checks whole packages, so a package's files must be
+# linted in one invocation; every other linter is split into parallel chunks
+UNCHUNKABLE_LINTERS = {"golangci-lint"}
+MAX_FILES_PER_LINT_RUN = 50
 
 # Issue categories
 CATEGORY_SYNTAX = "syntax"
 CATEGORY_MEMORY = "memory"
 CATEGORY_SECURITY = "security"
 CATEGORY_STYLE = "style"
+CORE_CATEGORIES = frozenset({CATEGORY_SYNTAX, CATEGORY_MEMORY, CATEGORY_SECURITY})
+
+# Issue fields included in SyntaxCheckResult.to_dict(), in output order
+_ISSUE_KEYS = ("file", "line", "column", "severity", "message", "rule", "language")
+_issue_values = operator.attrgetter(*_ISSUE_KEYS)
 
 
-@dataclass
+@dataclass(slots=True)
 class SyntaxIssue:
     file: str
     line: int
@@ -44,7 +93,7 @@ class SyntaxIssue:
     category: str = "style"  # syntax, memory, security, style
 
 
-@dataclass
+@dataclass(slots=True)
 class SyntaxCheckResult:
     success: bool
     issues: list[SyntaxIssue] = field(default_factory=list)
@@ -52,51 +101,70 @@ class SyntaxCheckResult:
     files_by_language: dict = field(default_factory=dict)
     error: Optional[str] = None
 
+    # Groupings built by _index() on first access
+    _by_severity: Optional[dict[str, int]] = field(default=None, init=False, repr=False, compare=False)
+    _by_file: Optional[dict[str, list[SyntaxIssue]]] = field(default=None, init=False, repr=False, compare=False)
+    _by_category: Optional[dict[str, list[SyntaxIssue]]] = field(default=None, init=False, repr=False, compare=False)
+
+    def _index(self):
+        """Group issues by severity, file and category in a single pass."""
+        by_severity = {}
+        by_file = {}
+        by_category = {}
+        for issue in self.issues:
+            by_severity[issue.severity] = by_severity.get(issue.severity, 0) + 1
+            by_file.setdefault(issue.file, []).append(issue)
+            by_category.setdefault(issue.category, []).append(issue)
+        self._by_severity = by_severity
+        self._by_file = by_file
+        self._by_category = by_category
+
+    def invalidate(self):
+        """Drop the cached groupings after mutating ``issues``."""
+        self._by_severity = self._by_file = self._by_category = None
+
     @property
     def total_issues(self) -> int:
         return len(self.issues)
 
     @property
     def issues_by_severity(self) -> dict[str, int]:
-        counts = {}
-        for issue in self.issues:
-            counts[issue.severity] = counts.get(issue.severity, 0) + 1
-        return counts
+        if self._by_severity is None:
+            self._index()
+        return self._by_severity
 
     @property
     def issues_by_file(self) -> dict[str, list[SyntaxIssue]]:
-        by_file = {}
-        for issue in self.issues:
-            by_file.setdefault(issue.file, []).append(issue)
-        return by_file
+        if self._by_file is None:
+            self._index()
+        return self._by_file
 
     @property
     def issues_by_category(self) -> dict[str, list[SyntaxIssue]]:
         """Group issues by category (syntax, memory, security, style)."""
-        by_category = {}
-        for issue in self.issues:
-            by_category.setdefault(issue.category, []).append(issue)
-        return by_category
+        if self._by_category is None:
+            self._index()
+        return self._by_category
 
     @property
     def memory_issues(self) -> list[SyntaxIssue]:
         """Get only memory/resource leak related issues."""
-        return [i for i in self.issues if i.category == CATEGORY_MEMORY]
+        return self.issues_by_category.get(CATEGORY_MEMORY, [])
 
     @property
     def security_issues(self) -> list[SyntaxIssue]:
         """Get only security related issues."""
-        return [i for i in self.issues if i.category == CATEGORY_SECURITY]
+        return self.issues_by_category.get(CATEGORY_SECURITY, [])
 
     @property
     def syntax_errors(self) -> list[SyntaxIssue]:
         """Get only syntax error issues."""
-        return [i for i in self.issues if i.category == CATEGORY_SYNTAX]
+        return self.issues_by_category.get(CATEGORY_SYNTAX, [])
     
     @property
     def core_issues(self) -> list[SyntaxIssue]:
         """Get only core issues (syntax, memory, security) - excludes style."""
-        return [i for i in self.issues if i.category in (CATEGORY_SYNTAX, CATEGORY_MEMORY, CATEGORY_SECURITY)]
+        return [i for i in self.issues if i.category in CORE_CATEGORIES]
 
     def to_dict(self) -> dict:
         return {
@@ -105,22 +173,151 @@ class SyntaxCheckResult:
             "files_analyzed": self.files_analyzed,
             "files_by_language": self.files_by_language,
             "issues_by_severity": self.issues_by_severity,
-            "issues": [
-                {
-                    "file": i.file,
-                    "line": i.line,
-                    "column": i.column,
-                    "severity": i.severity,
-                    "message": i.message,
-                    "rule": i.rule,
-                    "language": i.language,
-                }
-                for i in self.issues
-            ],
+            "issues": [dict(zip(_ISSUE_KEYS, _issue_values(i))) for i in self.issues],
             "error": self.error,
         }
 
 
+@lru_cache(maxsize=8192)
+def _detect_language(path: str) -> Optional[str]:
+    """Language for ``path`` by extension; memoized across SyntaxChecker instances."""
+    return EXT_TO_LANG.get(os.path.splitext(path)[1].lower())
+
+
+def _filter_existing(paths: list[str]) -> list[str]:
+    """
+    Return the paths that exist, in their original order.
+
+    Directories holding several of the paths are listed once with scandir
+    instead of stat-ing each file; lone files are checked directly.
+    """
+    per_dir = Counter(os.path.dirname(p) for p in paths)
+    listings: dict[str, set[str]] = {}
+    existing = []
+    for path in paths:
+        directory, name = os.path.split(path)
+        if per_dir[directory] < 2:
+            if os.path.exists(path):
+                existing.append(path)
+            continue
+
+        names = listings.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory or ".") as it:
+                    # Broken symlinks are listed but don't exist
+                    names = {
+                        e.name for e in it
+                        if not e.is_symlink() or os.path.exists(e.path)
+                    }
+            except OSError:
+                names = set()
+            listings[directory] = names
+        if name in names:
+            existing.append(path)
+    return existing
+
+
+class _LintCache:
+    """
+    On-disk lint results keyed by file, one JSON file per language.
+
+    Each file stores a stamp (linter name, version and config) and a map from
+    ``entry_keys`` keys (relative path, project linter config and content
+    digest) to that file's issues without their path. A different stamp,
+    e.g. after a linter upgrade, discards the stored entries.
+    """
+
+    MAX_ENTRIES = 10000
+    # Larger files are hashed in chunks instead of being read whole
+    STREAM_THRESHOLD = 1024 * 1024
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @classmethod
+    def digest(cls, path: str) -> str:
+        """Non-cryptographic content digest: xxh3-128 if xxhash is installed, else BLAKE2b."""
+        if os.path.getsize(path) <= cls.STREAM_THRESHOLD:
+            return _content_hash(FileIndex.read(path)).hexdigest()
+        h = _content_hash()
+        with open(path, "rb") as f:
+            while chunk := f.read(cls.STREAM_THRESHOLD):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @classmethod
+    def entry_keys(cls, linter_name: str, root: str, files: list[str]) -> dict[str, str]:
+        """
+        Cache key of each readable file in ``files``: its path relative to
+        ``root``, the linter config that applies to it and its content digest.
+        """
+        names = LINTER_CONFIG_FILES.get(linter_name, ())
+        config_digests: dict[str, str] = {}
+
+        def config_digest(directory: str) -> str:
+            digest = config_digests.get(directory)
+            if digest is None:
+                h = _content_hash()
+                parent = os.path.dirname(directory)
+                if directory != root and parent != directory:
+                    h.update(config_digest(parent).encode())
+                for name in names:
+                    try:
+                        data = FileIndex.read(os.path.join(directory, name))
+                    except OSError:
+                        continue
+                    h.update(name.encode() + b"\0" + data + b"\0")
+                digest = config_digests[directory] = h.hexdigest()
+            return digest
+
+        root = os.path.abspath(root)
+        keys = {}
+        for path in files:
+            try:
+                digest = cls.digest(path)
+            except OSError:
+                continue
+            full = os.path.normpath(os.path.abspath(path))
+            rel = os.path.relpath(full, root)
+            keys[path] = f"{rel}|{config_digest(os.path.dirname(full))}|{digest}"
+        return keys
+
+    def _path(self, lang: str) -> str:
+        return os.path.join(self.directory, f"{lang}.json")
+
+    def load(self, lang: str, stamp: str) -> dict[str, list[dict]]:
+        try:
+            with open(self._path(lang), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("stamp") != stamp:
+            return {}
+        return data.get("entries", {})
+
+    def save(self, lang: str, stamp: str, entries: dict[str, list[dict]]):
+        if len(entries) > self.MAX_ENTRIES:
+            entries = dict(list(entries.items())[-self.MAX_ENTRIES:])
+        path = self._path(lang)
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # A unique temp file per save: concurrent saves (webhook threads)
+            # each replace the cache file whole instead of interleaving writes
+            fd, tmp_path = tempfile.mkstemp(prefix=f"{lang}.", suffix=".tmp", dir=self.directory)
+            with open(fd, "w", encoding="utf-8") as f:
+                json.dump({"stamp": stamp, "entries": entries}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write lint cache {path}: {e}")
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
 class SyntaxChecker:
     """
     Fixed node for syntax checking - no LLM required.
@@ -133,18 +330,28 @@ class SyntaxChecker:
 
     def __init__(
         self,
-        linter: Optional[LinterTool] = None,
+        linter: Optional["LinterTool"] = None,
         enable_memory_checks: bool = True,
         strict_mode: bool = False,
+        cache_dir: Optional[str] = None,
+        enabled_bundles: Optional[set[str]] = None,
     ):
-        config = LinterConfig(
-            enable_memory_checks=enable_memory_checks,
-            strict_mode=strict_mode,
-        )
-        self.linter = linter or LinterTool(config=config)
+        if linter is None:
+            from tools.linter import LinterTool, LinterConfig
+
+            linter = LinterTool(config=LinterConfig(
+                enable_memory_checks=enable_memory_checks,
+                strict_mode=strict_mode,
+                enabled_bundles=enabled_bundles,
+            ))
+        self.linter = linter
         self._available_linters = self.linter._available_linters
         self.enable_memory_checks = enable_memory_checks
 
+        cache_dir = Config.LINT_CACHE_DIR if cache_dir is None else cache_dir
+        self._lint_cache = _LintCache(cache_dir) if cache_dir else None
+        self._linter_versions: dict[str, Optional[str]] = {}
+
     def get_available_linters(self) -> dict[str, bool]:
         return {k: v for k, v in self._available_linters.items() if v}
 
@@ -152,11 +359,9 @@ class SyntaxChecker:
         """Group files by their detected language."""
         result = {lang: [] for lang in LANG_EXTENSIONS}
         for filepath in files:
-            ext = os.path.splitext(filepath)[1].lower()
-            for lang, extensions in LANG_EXTENSIONS.items():
-                if ext in extensions:
-                    result[lang].append(filepath)
-                    break
+            lang = _detect_language(filepath)
+            if lang:
+                result[lang].append(filepath)
         return {k: v for k, v in result.items() if v}
 
     def _get_linter_for_language(self, lang: str) -> Optional[str]:
@@ -173,10 +378,220 @@ class SyntaxChecker:
             return linter_name
         return None
 
+    async def _get_linter_version(self, linter_name: str) -> Optional[str]:
+        """Return ``<linter> --version`` output, memoized; None if it can't be run."""
+        if linter_name not in self._linter_versions:
+            version = None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self.linter._find_executable(linter_name) or linter_name,
+                    "--version",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                stdout, _ = await proc.communicate()
+                if proc.returncode == 0:
+                    version = stdout.decode(errors="replace").strip()
+            except OSError:
+                pass
+            self._linter_versions[linter_name] = version
+        return self._linter_versions[linter_name]
+
+    async def _changed_since(
+        self,
+        codebase_path: str,
+        changed_files: list[str],
+        since_ref: str,
+    ) -> list[str]:
+        """
+        Narrow ``changed_files`` to those that differ from ``since_ref`` in git.
+
+        Untracked files count as changed. Returns ``changed_files`` unchanged
+        if git can't be run or either command fails.
+        """
+        async def git(*args: str) -> Optional[set[str]]:
+            proc = await asyncio.create_subprocess_exec(
+                "git", "-C", codebase_path, *args, "--", *changed_files,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await proc.communicate()
+            if proc.returncode != 0:
+                return None
+            return {os.path.normpath(p) for p in stdout.decode(errors="replace").splitlines() if p}
+
+        try:
+            diffed, untracked = await asyncio.gather(
+                git("diff", "--name-only", "--relative", since_ref),
+                git("ls-files", "--others", "--exclude-standard"),
+            )
+        except OSError:
+            return changed_files
+        if diffed is None or untracked is None:
+            logger.warning(f"git diff against {since_ref} failed, checking all files")
+            return changed_files
+
+        delta = diffed | untracked
+        return [f for f in changed_files if os.path.normpath(f) in delta]
+
+    @staticmethod
+    def _chunk(files: list[str], max_per: int = MAX_FILES_PER_LINT_RUN) -> list[list[str]]:
+        """Split files into one slice per CPU, at most ``max_per`` files each."""
+        size = min(max_per, max(1, math.ceil(len(files) / (os.cpu_count() or 1))))
+        return [files[i:i + size] for i in range(0, len(files), size)]
+
+    async def _run_linter_chunked(
+        self,
+        lang: str,
+        linter_name: str,
+        files: list[str],
+    ) -> ToolResult:
+        """Run the linter over ``files`` as concurrent chunked invocations."""
+        if linter_name in UNCHUNKABLE_LINTERS or len(files) <= 1:
+            return await self.linter.run_on_files(files, language=lang)
+
+        results = await asyncio.gather(*(
+            self.linter.run_on_files(chunk, language=lang)
+            for chunk in self._chunk(files)
+        ))
+        for result in results:
+            if not result.success:
+                return result
+
+        return ToolResult(
+            success=True,
+            output="\n".join(r.output for r in results if r.output),
+            issues=[issue for r in results for issue in r.issues],
+            metadata=results[0].metadata,
+        )
+
+    async def _run_linter_cached(
+        self,
+        lang: str,
+        linter_name: str,
+        files: list[str],
+        codebase_path: Optional[str] = None,
+    ) -> ToolResult:
+        """
+        Run the linter for ``lang`` on only the files whose content has no
+        cached result, and merge in the cached issues for the rest.
+
+        Caching needs ``codebase_path``: findings depend on the project's
+        linter config and on paths within it, which are part of the key.
+        """
+        version = None
+        if self._lint_cache and codebase_path and linter_name in CACHEABLE_LINTERS:
+            version = await self._get_linter_version(linter_name)
+        if not version:
+            return await self._run_linter_chunked(lang, linter_name, files)
+
+        config = self.linter.config
+        bundles = None if config.enabled_bundles is None else sorted(config.enabled_bundles)
+        stamp = f"{linter_name}|{version}|{config.enable_memory_checks}|{config.strict_mode}|{bundles}"
+        # Reading, hashing and the JSON cache file stay off the event loop
+        entries, keys = await asyncio.gather(
+            asyncio.to_thread(self._lint_cache.load, lang, stamp),
+            asyncio.to_thread(_LintCache.entry_keys, linter_name, codebase_path, files),
+        )
+
+        issues = []
+        misses = {}
+        for path, key in keys.items():
+            cached = entries.get(key)
+            if cached is None:
+                misses[os.path.abspath(path)] = (path, key)
+            else:
+                issues.extend({**issue, "file": path} for issue in cached)
+
+        if not misses:
+            logger.info(f"  All {len(files)} {lang} files served from lint cache")
+            return ToolResult(success=True, output="", issues=issues)
+
+        result = await self._run_linter_chunked(
+            lang, linter_name, [path for path, _ in misses.values()]
+        )
+        if not result.success:
+            return result
+
+        # Split the run's issues back per file; only cache if every issue
+        # maps to one of the linted files
+        per_file = {abs_path: [] for abs_path in misses}
+        mappable = True
+        for issue in result.issues:
+            found = per_file.get(os.path.abspath(issue.get("file", "")))
+            if found is None:
+                mappable = False
+                break
+            found.append({k: v for k, v in issue.items() if k != "file"})
+
+        if mappable:
+            for abs_path, (_, key) in misses.items():
+                entries[key] = per_file[abs_path]
+            await asyncio.to_thread(self._lint_cache.save, lang, stamp, entries)
+
+        issues.extend(result.issues)
+        return ToolResult(
+            success=True,
+            output=result.output,
+            issues=issues,
+            metadata=result.metadata,
+        )
+
+    async def _run_lang(
+        self,
+        lang: str,
+        files: list[str],
+        codebase_path: Optional[str] = None,
+    ) -> list[SyntaxIssue]:
+        """Lint one language's files and convert the results to SyntaxIssues."""
+        linter_name = self._get_linter_for_language(lang)
+        if not linter_name:
+            logger.warning(f"No linter available for {lang}, skipping {len(files)} files")
+            return []
+
+        logger.info(f"Running {linter_name} on {len(files)} {lang} files")
+
+        result = await self._run_linter_cached(lang, linter_name, files, codebase_path)
+
+        issues = []
+        if result.success and result.issues:
+            # Make file paths relative for cleaner output, once per file
+            rel_paths = {}
+
+            def relative(file_path: str) -> str:
+                rel = rel_paths.get(file_path)
+                if rel is None:
+                    rel = file_path
+                    if codebase_path and file_path.startswith(codebase_path):
+                        rel = os.path.relpath(file_path, codebase_path)
+                    rel_paths[file_path] = rel
+                return rel
+
+            issues = [
+                SyntaxIssue(
+                    file=relative(get("file", "")),
+                    line=get("line", 0),
+                    column=get("column", 0),
+                    severity=get("severity", "warning"),
+                    message=get("message", ""),
+                    rule=get("rule", ""),
+                    language=lang,
+                    category=get("category", "style"),
+                )
+                for get in (issue.get for issue in result.issues)
+            ]
+
+            logger.info(f"  Found {len(result.issues)} issues in {lang} files")
+        elif not result.success:
+            logger.error(f"  Linter error for {lang}: {result.error}")
+
+        return issues
+
     async def check(
         self,
         codebase_path: str,
         changed_files: list[str],
+        since_ref: Optional[str] = None,
     ) -> SyntaxCheckResult:
         """
         Run syntax checks on the specified files.
@@ -184,73 +599,21 @@ class SyntaxChecker:
         Args:
             codebase_path: Root path of the codebase
             changed_files: List of file paths relative to codebase_path
+            since_ref: Git ref to diff against; files identical to it are skipped
             
         Returns:
             SyntaxCheckResult with all found issues
         """
         try:
-            # Build full paths and filter existing files
-            full_paths = []
-            for f in changed_files:
-                full_path = os.path.join(codebase_path, f)
-                if os.path.exists(full_path):
-                    full_paths.append(full_path)
-
-            if not full_paths:
-                return SyntaxCheckResult(
-                    success=True,
-                    files_analyzed=0,
-                    error="No files to analyze",
-                )
+            # Duplicates (e.g. from merging several diffs) would be linted twice
+            changed_files = list(dict.fromkeys(changed_files))
 
-            # Group by language
-            files_by_lang = self._group_by_language(full_paths)
-            
-            logger.info(f"Checking {len(full_paths)} files across {len(files_by_lang)} languages")
-
-            all_issues = []
-            files_analyzed_by_lang = {}
-
-            # Run linters per language
-            for lang, files in files_by_lang.items():
-                linter_name = self._get_linter_for_language(lang)
-                files_analyzed_by_lang[lang] = len(files)
-
-                if not linter_name:
-                    logger.warning(f"No linter available for {lang}, skipping {len(files)} files")
-                    continue
-
-                logger.info(f"Running {linter_name} on {len(files)} {lang} files")
-                
-                result = await self.linter.run_on_files(files, language=lang)
-                
-                if result.success and result.issues:
-                    for issue in result.issues:
-                        # Make file path relative for cleaner output
-                        file_path = issue.get("file", "")
-                        if file_path.startswith(codebase_path):
-                            file_path = os.path.relpath(file_path, codebase_path)
-                        
-                        all_issues.append(SyntaxIssue(
-                            file=file_path,
-                            line=issue.get("line", 0),
-                            column=issue.get("column", 0),
-                            severity=issue.get("severity", "warning"),
-                            message=issue.get("message", ""),
-                            rule=issue.get("rule", ""),
-                            language=lang,
-                            category=issue.get("category", "style"),
-                        ))
-                    
-                    logger.info(f"  Found {len(result.issues)} issues in {lang} files")
-                elif not result.success:
-                    logger.error(f"  Linter error for {lang}: {result.error}")
+            if since_ref and changed_files:
+                changed_files = await self._changed_since(codebase_path, changed_files, since_ref)
 
-            return SyntaxCheckResult(
-                success=True,
-                issues=all_issues,
-                files_analyzed=len(full_paths),
-                files_by_language=files_analyzed_by_lang,
+            return await self._check_paths(
+                [os.path.join(codebase_path, f) for f in changed_files],
+                codebase_path,
             )
 
         except Exception as e:
@@ -270,70 +633,94 @@ class SyntaxChecker:
         Returns:
             SyntaxCheckResult with all found issues
         """
-        existing_files = [f for f in files if os.path.exists(f)]
-        
-        if not existing_files:
+        try:
+            return await self._check_paths(list(dict.fromkeys(files)))
+
+        except Exception as e:
+            logger.exception("Syntax check failed")
+            return SyntaxCheckResult(
+                success=False,
+                error=str(e),
+            )
+
+    async def _check_paths(
+        self,
+        paths: list[str],
+        codebase_path: Optional[str] = None,
+    ) -> SyntaxCheckResult:
+        """
+        Shared implementation of check and check_files.
+
+        Issue paths are reported relative to ``codebase_path`` when given,
+        otherwise as the linter returned them.
+        """
+        full_paths = _filter_existing(paths)
+
+        if not full_paths:
             return SyntaxCheckResult(
                 success=True,
                 files_analyzed=0,
                 error="No files to analyze",
             )
 
-        files_by_lang = self._group_by_language(existing_files)
+        # Group by language
+        files_by_lang = self._group_by_language(full_paths)
         
-        all_issues = []
-        files_analyzed_by_lang = {}
+        logger.info(f"Checking {len(full_paths)} files across {len(files_by_lang)} languages")
 
-        for lang, lang_files in files_by_lang.items():
-            linter_name = self._get_linter_for_language(lang)
-            files_analyzed_by_lang[lang] = len(lang_files)
+        files_analyzed_by_lang = {lang: len(files) for lang, files in files_by_lang.items()}
 
-            if not linter_name:
-                continue
+        # Linters for different languages are independent subprocesses
+        lang_results = await asyncio.gather(
+            *(
+                self._run_lang(lang, files, codebase_path)
+                for lang, files in files_by_lang.items()
+            ),
+            return_exceptions=True,
+        )
 
-            result = await self.linter.run_on_files(lang_files, language=lang)
-            
-            if result.success and result.issues:
-                for issue in result.issues:
-                    all_issues.append(SyntaxIssue(
-                        file=issue.get("file", ""),
-                        line=issue.get("line", 0),
-                        column=issue.get("column", 0),
-                        severity=issue.get("severity", "warning"),
-                        message=issue.get("message", ""),
-                        rule=issue.get("rule", ""),
-                        language=lang,
-                    ))
+        all_issues = []
+        for lang, lang_issues in zip(files_by_lang, lang_results):
+            if isinstance(lang_issues, Exception):
+                logger.error(f"  Linter run failed for {lang}: {lang_issues}")
+            else:
+                all_issues.extend(lang_issues)
 
         return SyntaxCheckResult(
             success=True,
             issues=all_issues,
-            files_analyzed=len(existing_files),
+            files_analyzed=len(full_paths),
             files_by_language=files_analyzed_by_lang,
         )
 
 
-def print_syntax_report(result: SyntaxCheckResult, verbose: bool = False):
-    """Print a formatted syntax check report."""
-    print(f"\n{'='*60}")
-    print(" Syntax Check Report (with Memory/Resource Analysis)")
-    print('='*60)
+def print_syntax_report(
+    result: SyntaxCheckResult,
+    verbose: bool = False,
+    file: Optional[TextIO] = None,
+):
+    """Print a formatted syntax check report to ``file`` (stdout by default) in one write."""
+    out: list[str] = []
+    out.append(f"\n{'='*60}")
+    out.append(" Syntax Check Report (with Memory/Resource Analysis)")
+    out.append('='*60)
     
     if not result.success:
-        print(f"\nError: {result.error}")
+        out.append(f"\nError: {result.error}")
+        (file or sys.stdout).write("\n".join(out) + "\n")
         return
     
-    print(f"\nFiles analyzed: {result.files_analyzed}")
+    out.append(f"\nFiles analyzed: {result.files_analyzed}")
     if result.files_by_language:
         for lang, count in result.files_by_language.items():
-            print(f"  - {lang}: {count} files")
+            out.append(f"  - {lang}: {count} files")
     
-    print(f"\nTotal issues: {result.total_issues}")
+    out.append(f"\nTotal issues: {result.total_issues}")
     
     # Show issues by category
     by_category = result.issues_by_category
     if by_category:
-        print("\nIssues by category:")
+        out.append("\nIssues by category:")
         category_icons = {
             "syntax": "!",
             "memory": "M",
@@ -344,47 +731,48 @@ def print_syntax_report(result: SyntaxCheckResult, verbose: bool = False):
             count = len(by_category.get(cat, []))
             if count:
                 icon = category_icons.get(cat, "-")
-                print(f"  [{icon}] {cat}: {count}")
+                out.append(f"  [{icon}] {cat}: {count}")
     
     # Show issues by severity
     if result.issues_by_severity:
-        print("\nIssues by severity:")
+        out.append("\nIssues by severity:")
         for severity in ["error", "warning", "info"]:
             count = result.issues_by_severity.get(severity, 0)
             if count:
-                print(f"  - {severity}: {count}")
+                out.append(f"  - {severity}: {count}")
     
     # Highlight memory issues specifically
     memory_issues = result.memory_issues
     if memory_issues:
-        print(f"\n*** Memory/Resource Issues ({len(memory_issues)}) ***")
+        out.append(f"\n*** Memory/Resource Issues ({len(memory_issues)}) ***")
         for issue in memory_issues[:5]:
-            print(f"  {issue.file}:{issue.line} [{issue.rule}]")
-            print(f"    {issue.message}")
+            out.append(f"  {issue.file}:{issue.line} [{issue.rule}]")
+            out.append(f"    {issue.message}")
         if len(memory_issues) > 5:
-            print(f"  ... and {len(memory_issues) - 5} more memory issues")
+            out.append(f"  ... and {len(memory_issues) - 5} more memory issues")
     
     # Highlight security issues
     security_issues = result.security_issues
     if security_issues:
-        print(f"\n*** Security Issues ({len(security_issues)}) ***")
+        out.append(f"\n*** Security Issues ({len(security_issues)}) ***")
         for issue in security_issues[:5]:
-            print(f"  {issue.file}:{issue.line} [{issue.rule}]")
-            print(f"    {issue.message}")
+            out.append(f"  {issue.file}:{issue.line} [{issue.rule}]")
+            out.append(f"    {issue.message}")
         if len(security_issues) > 5:
-            print(f"  ... and {len(security_issues) - 5} more security issues")
+            out.append(f"  ... and {len(security_issues) - 5} more security issues")
     
     if result.issues and verbose:
-        print("\nAll issues by file:")
+        out.append("\nAll issues by file:")
         for filepath, issues in result.issues_by_file.items():
-            print(f"\n  {filepath} ({len(issues)} issues):")
+            out.append(f"\n  {filepath} ({len(issues)} issues):")
             for issue in issues[:10]:
                 cat_icon = {"memory": "M", "security": "S", "syntax": "!", "style": "-"}.get(issue.category, "-")
-                print(f"    Line {issue.line}: [{cat_icon}][{issue.severity.upper()}] {issue.rule}")
-                print(f"      {issue.message}")
+                out.append(f"    Line {issue.line}: [{cat_icon}][{issue.severity.upper()}] {issue.rule}")
+                out.append(f"      {issue.message}")
             if len(issues) > 10:
-                print(f"    ... and {len(issues) - 10} more")
+                out.append(f"    ... and {len(issues) - 10} more")
     elif result.issues and not memory_issues and not security_issues:
-        print("\nRun with verbose=True for detailed issues")
+        out.append("\nRun with verbose=True for detailed issues")
     
-    print(f"\n{'='*60}")
+    out.append(f"\n{'='*60}")
+    (file or sys.stdout).write("\n".join(out) + "\n")
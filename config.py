@@ -1,9 +1,26 @@
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+@lru_cache(maxsize=8)
+def _parse_monitored_repos(value: str) -> frozenset[str]:
+    """Repository names from a MONITORED_REPOS value, without org prefixes."""
+    if not value or value == "*":
+        # Empty or "*" means monitor all repositories
+        return frozenset()
+
+    # Support both "repo" and "org/repo" formats
+    return frozenset(
+        repo.strip().rsplit("/", 1)[-1]
+        for repo in value.split(",")
+        if repo.strip()
+    )
+
+
 class Config:
     GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")
     GITHUB_PRIVATE_KEY_PATH = os.getenv("GITHUB_PRIVATE_KEY_PATH")
@@ -27,6 +44,9 @@ class Config:
     VULN_MAX_UNITS_LOGIC = int(os.getenv("VULN_MAX_UNITS_LOGIC", 12))
     VULN_MAX_UNITS_SECURITY = int(os.getenv("VULN_MAX_UNITS_SECURITY", 10))
 
+    # Persistent per-file lint results, reused across runs; empty disables it
+    LINT_CACHE_DIR = os.getenv("LINT_CACHE_DIR", os.path.join(".wcw_cache", "lint"))
+
     # Monitored Repositories Configuration
     # Format: comma-separated list of repository names (e.g., "repo1,repo2")
     # Can also use full names "org/repo1,org/repo2" for backward compatibility
@@ -41,35 +61,17 @@ class Config:
             return f.read()
 
     @classmethod
-    def get_monitored_repos(cls) -> set:
+    def get_monitored_repos(cls) -> frozenset[str]:
         """Get the set of monitored repository names.
 
+        The value is parsed once and cached, so repeated calls are a lookup.
+
         Returns:
-            set: Set of repository names (e.g., "repo1", "repo2").
+            frozenset: Repository names (e.g., "repo1", "repo2").
                  Empty set means monitor all repositories.
                  The set only contains repository names without org prefix.
         """
-        if not cls.MONITORED_REPOS or cls.MONITORED_REPOS == "*":
-            # Empty or "*" means monitor all repositories
-            return set()
-
-        # Parse comma-separated repository list
-        repos = []
-        for repo in cls.MONITORED_REPOS.split(","):
-            repo = repo.strip()
-            if not repo:
-                continue
-
-            # Support both "repo" and "org/repo" formats
-            if "/" in repo:
-                # Extract only the repo name from "org/repo"
-                repo_name = repo.split("/")[-1]
-            else:
-                repo_name = repo
-
-            repos.append(repo_name)
-
-        return set(repos)
+        return _parse_monitored_repos(cls.MONITORED_REPOS)
 
     @classmethod
     def is_repo_monitored(cls, repo_full_name: str) -> bool:
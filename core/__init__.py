@@ -1,5 +1,7 @@
 from core.github_client import GitHubClient
 from core.git_client import GitClient, CloneResult
 from core.repo_manager import RepoManager, PRContext
+from core.cache import TTLCache, content_key
+from core.file_index import FileIndex
 
-__all__ = ["GitHubClient", "GitClient", "CloneResult", "RepoManager", "PRContext"]
+__all__ = ["GitHubClient", "GitClient", "CloneResult", "RepoManager", "PRContext", "TTLCache", "content_key", "FileIndex"]
@@ -0,0 +1,119 @@
+"""
+Shared source-file discovery and reads for analysis agents.
+
+Several agents scan the same codebase in one analysis run. Walking the tree
+and reading each file once, then serving every agent from the cached result,
+avoids repeating the traversal and the file reads per agent.
+"""
+
+import os
+from typing import Iterable, Optional
+
+from core.cache import TTLCache
+
+# Dependency, cache and build directories that never hold reviewable sources
+PRUNED_DIRS = frozenset({
+    "node_modules",
+    "__pycache__",
+    "venv",
+    "site-packages",
+})
+
+# Larger files are generated or bundled code, not worth showing an LLM
+MAX_SOURCE_BYTES = 512 * 1024
+
+
+def _entry_name(entry: os.DirEntry) -> str:
+    return entry.name
+
+
+class FileIndex:
+    """
+    Cached directory listings and file contents.
+
+    Listings are keyed by the root path and its mtime and expire after a short
+    TTL, since nested changes don't touch the root's mtime. File contents are
+    keyed by (path, mtime, size) so an edited file is always re-read; files
+    over MAX_SOURCE_BYTES are read uncached, which bounds the cache at
+    512 * MAX_SOURCE_BYTES however large a repository's bundles are.
+    """
+
+    _listings = TTLCache(maxsize=32, ttl=30)
+    _contents = TTLCache(maxsize=512, ttl=30)
+
+    @classmethod
+    def get(cls, root: str, extensions: Iterable[str]) -> list[str]:
+        """Return files under ``root`` whose extension is in ``extensions``, in walk order."""
+        key = (root, os.stat(root).st_mtime_ns)
+        entries = cls._listings.get(key)
+        if entries is None:
+            entries = cls._walk(root)
+            cls._listings.set(key, entries)
+
+        wanted = frozenset(extensions)
+        return [path for path, ext in entries if ext in wanted]
+
+    @classmethod
+    def read(cls, path: str) -> bytes:
+        """Return the raw contents of ``path``, shared between agents."""
+        return cls._read(path, os.stat(path))
+
+    @classmethod
+    def read_source(cls, path: str, max_size: int = MAX_SOURCE_BYTES) -> Optional[bytes]:
+        """Like ``read``, but None for files over ``max_size`` bytes or that look binary."""
+        st = os.stat(path)
+        if st.st_size > max_size:
+            return None
+        data = cls._read(path, st)
+        if b"\0" in data[:4096]:
+            return None
+        return data
+
+    @classmethod
+    def _read(cls, path: str, st: os.stat_result) -> bytes:
+        if st.st_size > MAX_SOURCE_BYTES:
+            with open(path, "rb") as f:
+                return f.read()
+
+        key = (path, st.st_mtime_ns, st.st_size)
+        data = cls._contents.get(key)
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+            cls._contents.set(key, data)
+        return data
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._listings.clear()
+        cls._contents.clear()
+
+    @staticmethod
+    def _walk(root: str) -> list[tuple[str, str]]:
+        """
+        Pre-order scandir traversal with each directory's entries sorted by
+        name, so listings (and the prompts built from them) don't depend on
+        the filesystem's directory order.
+
+        Dot-directories (.git, .venv, ...) and PRUNED_DIRS are never descended
+        into. The extension is taken from the entry name, no path splitting.
+        """
+        entries = []
+        stack = [root]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue
+            subdirs = []
+            with it:
+                for entry in sorted(it, key=_entry_name):
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if name[0] != "." and name not in PRUNED_DIRS:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        dot = name.rfind(".")
+                        entries.append((entry.path, name[dot:] if dot > 0 else ""))
+            stack.extend(reversed(subdirs))
+        return entries
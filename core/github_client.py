@@ -7,11 +7,18 @@ from config import Config
 
 
 class GitHubClient:
+    # GitHub's maximum page size for REST list endpoints; the default of 30
+    # triples the number of round-trips needed to list a large PR's files.
+    PER_PAGE = 100
+    # Seconds before a raw REST request gives up, PyGithub's default timeout
+    REQUEST_TIMEOUT = 15
+
     def __init__(self, installation_id: int):
         self.installation_id = installation_id
         self.app_id = Config.GITHUB_APP_ID
         self.private_key = Config.get_private_key()
         self._github = None
+        self._token = None
         self._token_expires_at = 0
 
     def _generate_jwt(self) -> str:
@@ -40,11 +47,18 @@ class GitHubClient:
         """Get installation access token for Git operations (e.g., cloning private repos)."""
         return self._get_installation_token()
 
+    def _get_token(self) -> str:
+        """Return the cached installation token, refreshing it when expired."""
+        if self._token is None or time.time() >= self._token_expires_at:
+            self._token = self._get_installation_token()
+            self._github = None
+        return self._token
+
     @property
     def github(self) -> Github:
-        if self._github is None or time.time() >= self._token_expires_at:
-            token = self._get_installation_token()
-            self._github = Github(token)
+        token = self._get_token()
+        if self._github is None:
+            self._github = Github(token, per_page=self.PER_PAGE)
         return self._github
 
     def get_pr(self, repo_full_name: str, pr_number: int):
@@ -66,6 +80,25 @@ class GitHubClient:
         pr = self.get_pr(repo_full_name, pr_number)
         pr.create_review(body=body, event=event, comments=comments or [])
 
+    def create_review_raw(self, repo_full_name: str, pr_number: int, payload: bytes):
+        """POST an already JSON-encoded review payload (body, event, comments)."""
+        url = f"https://api.github.com/repos/{repo_full_name}/pulls/{pr_number}/reviews"
+        headers = {
+            "Authorization": f"Bearer {self._get_token()}",
+            "Accept": "application/vnd.github+json",
+            "Content-Type": "application/json",
+        }
+        response = requests.post(
+            url, headers=headers, data=payload, timeout=self.REQUEST_TIMEOUT
+        )
+        if not response.ok:
+            # Include GitHub's error body (e.g. "could not be resolved") in the message
+            raise requests.HTTPError(
+                f"{response.status_code} {response.reason}: {response.text}",
+                response=response,
+            )
+        return response.json()
+
     def create_issue_comment(self, repo_full_name: str, pr_number: int, body: str):
         pr = self.get_pr(repo_full_name, pr_number)
         pr.create_issue_comment(body)
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import logging
 from core.github_client import GitHubClient
 
@@ -49,23 +50,70 @@ class PRExporter:
         full_diff = self.client.get_pr_full_diff(repo_full_name, pr_number)
         self._save_text(output_dir, "pr.diff", full_diff)
 
-        self._export_commits_with_diffs(repo_full_name, commits, output_dir)
-
-        functional_summary = None
-        if self.llm:
-            try:
-                from agents.summary_agent import PRSummaryAgent
-                summary_agent = PRSummaryAgent(self.llm)
-                functional_summary = summary_agent.generate_summary(
-                    metadata, files_changed, commits, full_diff
-                )
-                self._save_json(output_dir, "functional_summary.json", functional_summary)
-                logger.info(f"Generated functional summary for PR #{pr_number}")
-            except Exception as e:
-                logger.error(f"Failed to generate functional summary: {e}", exc_info=True)
+        functional_summary = asyncio.run(
+            self._export_commits_and_summarize(
+                repo_full_name, pr_number, output_dir,
+                metadata, files_changed, commits, full_diff,
+            )
+        )
 
         return output_dir, functional_summary
 
+    async def _export_commits_and_summarize(
+        self,
+        repo_full_name: str,
+        pr_number: int,
+        output_dir: str,
+        metadata: dict,
+        files_changed: list,
+        commits: list,
+        full_diff: str,
+    ):
+        """Export per-commit diffs while the functional summary LLM call is in flight.
+
+        Both steps are dominated by network waits (GitHub API vs. LLM), so they
+        are overlapped instead of run back to back.
+
+        Returns:
+            The functional summary, or None if no LLM is configured or it failed.
+        """
+        export_task = asyncio.to_thread(
+            self._export_commits_with_diffs, repo_full_name, commits, output_dir
+        )
+        if not self.llm:
+            await export_task
+            return None
+
+        _, functional_summary = await asyncio.gather(
+            export_task,
+            self._generate_functional_summary(
+                pr_number, output_dir, metadata, files_changed, commits, full_diff
+            ),
+        )
+        return functional_summary
+
+    async def _generate_functional_summary(
+        self,
+        pr_number: int,
+        output_dir: str,
+        metadata: dict,
+        files_changed: list,
+        commits: list,
+        full_diff: str,
+    ):
+        try:
+            from agents.summary_agent import PRSummaryAgent
+            summary_agent = PRSummaryAgent(self.llm)
+            functional_summary = await summary_agent.generate_summary(
+                metadata, files_changed, commits, full_diff
+            )
+            self._save_json(output_dir, "functional_summary.json", functional_summary)
+            logger.info(f"Generated functional summary for PR #{pr_number}")
+            return functional_summary
+        except Exception as e:
+            logger.error(f"Failed to generate functional summary: {e}", exc_info=True)
+            return None
+
     def _export_commits_with_diffs(self, repo_full_name: str, commits: list, output_dir: str):
         commits_dir = os.path.join(output_dir, "commits")
         os.makedirs(commits_dir, exist_ok=True)
@@ -23,22 +23,35 @@ class KnowledgeBase(ABC):
     def __init__(self):
         self.entries: list[KnowledgeEntry] = []
         self._load_entries()
+        self._search_key = None
+        self._search_fields: list[tuple[str, str, tuple[str, ...], KnowledgeEntry]] = []
 
     @abstractmethod
     def _load_entries(self):
         pass
 
+    def _lowered_entries(self) -> list[tuple[str, str, tuple[str, ...], KnowledgeEntry]]:
+        """Lowercased title, description and tags per entry, rebuilt if ``entries`` changes."""
+        key = (id(self.entries), len(self.entries))
+        if key != self._search_key:
+            self._search_fields = [
+                (e.title.lower(), e.description.lower(), tuple(t.lower() for t in e.tags), e)
+                for e in self.entries
+            ]
+            self._search_key = key
+        return self._search_fields
+
     def search(self, query: str, limit: int = 10) -> list[KnowledgeEntry]:
         query_lower = query.lower()
         scored = []
-        for entry in self.entries:
+        for title, description, tags, entry in self._lowered_entries():
             score = 0
-            if query_lower in entry.title.lower():
+            if query_lower in title:
                 score += 3
-            if query_lower in entry.description.lower():
+            if query_lower in description:
                 score += 2
-            for tag in entry.tags:
-                if query_lower in tag.lower():
+            for tag in tags:
+                if query_lower in tag:
                     score += 1
             if score > 0:
                 scored.append((score, entry))
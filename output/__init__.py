@@ -11,6 +11,7 @@ from output.models import (
     MemoryAnalysis,
     LogicAnalysis,
     SecurityAnalysis,
+    bugs_to_dicts,
 )
 from output.report_generator import ReportGenerator
 
@@ -27,5 +28,6 @@ __all__ = [
     "MemoryAnalysis",
     "LogicAnalysis",
     "SecurityAnalysis",
+    "bugs_to_dicts",
     "ReportGenerator",
 ]
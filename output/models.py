@@ -47,6 +47,22 @@ class Bug:
     score_reasoning: Optional[str] = None
 
 
+def bugs_to_dicts(bugs: list[Bug]) -> list[dict]:
+    """Convert bugs to the plain dicts carried in AgentResult.issues."""
+    return [
+        {
+            "id": bug.id,
+            "type": bug.type.value,
+            "severity": bug.severity.value,
+            "title": bug.title,
+            "description": bug.description,
+            "file": bug.file,
+            "line": bug.line,
+        }
+        for bug in bugs
+    ]
+
+
 @dataclass
 class LineComment:
     path: str
@@ -1,3 +1,5 @@
+from typing import AbstractSet, Optional
+
 from output.models import AnalysisReport, LineComment
 
 
@@ -88,11 +90,18 @@ class ReportGenerator:
 
         return result
 
-    def generate_line_comments(self, report: AnalysisReport) -> list[dict]:
+    def generate_line_comments(
+        self,
+        report: AnalysisReport,
+        allowed_paths: Optional[AbstractSet[str]] = None,
+    ) -> list[dict]:
+        """Line comments for the review, optionally only for files in ``allowed_paths``."""
         comments = []
         seen_locations = set()
 
         for comment in report.line_comments:
+            if allowed_paths is not None and comment.path not in allowed_paths:
+                continue
             location = (comment.path, comment.line)
             if location in seen_locations:
                 continue
@@ -1,11 +1,27 @@
 import logging
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from operator import itemgetter
 from typing import Optional, Dict, Any, List
 
+from core.cache import TTLCache
 from output.models import AnalysisReport
 from output.report_generator import ReportGenerator
 
+try:
+    from orjson import dumps as json_dumps
+except ImportError:
+    import json
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
+# (id(client), repo_full_name, pr_number) -> filenames in the PR diff
+_PR_FILES_CACHE = TTLCache(maxsize=256, ttl=60)
+
 
 def _extract_code_context(
     diff_ir: Dict[str, Any],
@@ -60,9 +76,41 @@ def _extract_code_context(
     return None
 
 
+def _extract_review_unit_comments(
+    analysis_units: List[Dict[str, Any]],
+    file_line_mapping: Dict[str, Any],
+    issue_type: str,
+    comments: List[Dict[str, Any]],
+) -> None:
+    """Append inline comments for the issues of logic/security review units to ``comments``."""
+    for analysis_unit in analysis_units:
+        # Only process units that found issues
+        if analysis_unit.get("result") != "ISSUE":
+            continue
+
+        # Get the actual issues array within this unit
+        unit_issues = analysis_unit.get("issues", ())
+        unit_meta = analysis_unit.get("_meta", {})
+
+        # Handle both object and array formats:
+        #   - Array format: each entry is a location object
+        #   - Object format: single meta entry with hunk_id
+        meta_entries = unit_meta if isinstance(unit_meta, list) else (unit_meta,)
+
+        # Process each issue in this unit
+        for issue_obj in unit_issues:
+            for meta_entry in meta_entries:
+                comment = _convert_issue_to_inline_comment(
+                    issue_obj, file_line_mapping, issue_type, meta_entry
+                )
+                if comment:
+                    comments.append(comment)
+
+
 def _extract_inline_comments_from_issues(
     final_report: Dict[str, Any],
     diff_ir: Dict[str, Any],
+    file_line_mapping: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Extract issues from final_report and convert them to GitHub inline comments.
@@ -70,6 +118,7 @@ def _extract_inline_comments_from_issues(
     Args:
         final_report: The comprehensive analysis report containing logic_review and security_review
         diff_ir: The diff intermediate representation containing file changes with line numbers
+        file_line_mapping: Optional prebuilt result of _build_file_line_mapping(diff_ir)
 
     Returns:
         List of inline comment dicts with format: {path, body, line, side}
@@ -78,7 +127,10 @@ def _extract_inline_comments_from_issues(
 
     # Build a mapping of (file_path, old_line_range) -> new_line_in_diff
     # This helps us map issue locations to the actual PR diff lines
-    file_line_mapping = _build_file_line_mapping(diff_ir)
+    if file_line_mapping is None:
+        file_line_mapping = _build_file_line_mapping(
+            diff_ir, _referenced_file_paths(final_report)
+        )
 
     # Extract issues from logic_review
     # Structure: logic_review.issues[] is an array of analysis units
@@ -86,63 +138,16 @@ def _extract_inline_comments_from_issues(
     # _meta can be:
     #   - Object with hunk_id: {hunk_id, file_path, risk_score}  (Logic/Security Agent)
     #   - Array of location objects: [{file_path, line_start, line_end}, ...]  (deprecated)
-    logic_review = final_report.get("logic_review", {})
-    for analysis_unit in logic_review.get("issues", []):
-        # Only process units that found issues
-        if analysis_unit.get("result") != "ISSUE":
-            continue
-
-        # Get the actual issues array within this unit
-        unit_issues = analysis_unit.get("issues", [])
-        unit_meta = analysis_unit.get("_meta", {})
-
-        # Handle both object and array formats
-        meta_entries = []
-        if isinstance(unit_meta, list):
-            # Array format: each entry is a location object
-            meta_entries = unit_meta
-        else:
-            # Object format: single meta entry with hunk_id
-            meta_entries = [unit_meta]
-
-        # Process each issue in this unit
-        for issue_obj in unit_issues:
-            for meta_entry in meta_entries:
-                issue_obj_with_meta = {
-                    **issue_obj,
-                    "_meta": meta_entry,
-                }
-                comments.extend(_convert_issue_to_inline_comment(
-                    issue_obj_with_meta, file_line_mapping, "Logic"
-                ))
+    _extract_review_unit_comments(
+        final_report.get("logic_review", {}).get("issues", ()),
+        file_line_mapping, "Logic", comments,
+    )
 
     # Extract issues from security_review
-    security_review = final_report.get("security_review", {})
-    for analysis_unit in security_review.get("issues", []):
-        if analysis_unit.get("result") != "ISSUE":
-            continue
-
-        unit_issues = analysis_unit.get("issues", [])
-        unit_meta = analysis_unit.get("_meta", {})
-
-        # Handle both object and array formats
-        meta_entries = []
-        if isinstance(unit_meta, list):
-            # Array format: each entry is a location object
-            meta_entries = unit_meta
-        else:
-            # Object format: single meta entry with hunk_id
-            meta_entries = [unit_meta]
-
-        for issue_obj in unit_issues:
-            for meta_entry in meta_entries:
-                issue_obj_with_meta = {
-                    **issue_obj,
-                    "_meta": meta_entry,
-                }
-                comments.extend(_convert_issue_to_inline_comment(
-                    issue_obj_with_meta, file_line_mapping, "Security"
-                ))
+    _extract_review_unit_comments(
+        final_report.get("security_review", {}).get("issues", ()),
+        file_line_mapping, "Security", comments,
+    )
 
     # ✅ Extract issues from vulnerability_analysis (AI-based with precise line numbers)
     # Structure: vulnerability_analysis.feature_analyses[].vulnerabilities[]
@@ -328,16 +333,95 @@ def _extract_inline_comments_from_issues(
     return deduped_comments
 
 
-def _build_file_line_mapping(diff_ir: Dict[str, Any]) -> Dict[str, Any]:
+def _referenced_file_paths(final_report: Dict[str, Any]) -> set[str]:
+    """Return the file paths that logic, security and vulnerability issues point at."""
+    paths = set()
+    for review_key in ("logic_review", "security_review"):
+        for analysis_unit in final_report.get(review_key, {}).get("issues", []):
+            if analysis_unit.get("result") != "ISSUE" or not analysis_unit.get("issues"):
+                continue
+            unit_meta = analysis_unit.get("_meta", {})
+            for meta_entry in unit_meta if isinstance(unit_meta, list) else [unit_meta]:
+                paths.add(meta_entry.get("file_path"))
+
+    vuln_analysis = final_report.get("vulnerability_analysis", {})
+    for feature in vuln_analysis.get("feature_analyses", []):
+        for vuln in feature.get("vulnerabilities", []):
+            paths.add(vuln.get("file_path"))
+
+    paths.discard(None)
+    return paths
+
+
+# Files with more old->new pairs than this get an array-backed old_to_new
+COMPACT_LINE_MAP_MIN_PAIRS = 256
+_INT32_MAX = 2**31 - 1
+
+
+class _SortedLineMap:
+    """
+    Read-only old -> new line map over two parallel int32 arrays.
+
+    Stands in for the old_to_new dict of large files (only ``get`` is used)
+    at a fraction of a dict's per-entry memory; lookups bisect the sorted keys.
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, pairs: List[tuple[int, int]]):
+        self._keys = array("i")
+        self._values = array("i")
+        # Stable sort, so the last pair for a repeated old line wins, like dict()
+        for old_ln, new_ln in sorted(pairs, key=itemgetter(0)):
+            if self._keys and self._keys[-1] == old_ln:
+                self._values[-1] = new_ln
+            else:
+                self._keys.append(old_ln)
+                self._values.append(new_ln)
+
+    def get(self, key: Any, default: Optional[int] = None) -> Optional[int]:
+        if type(key) is not int:
+            # dict.get matches equal floats (2.0 == 2) and nothing else
+            if not (type(key) is float and key.is_integer()):
+                return default
+            key = int(key)
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._values[i]
+        return default
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def _line_map(pairs: List[tuple[int, int]]):
+    """old_to_new for a file: a dict, or a _SortedLineMap for many int32 pairs."""
+    if len(pairs) > COMPACT_LINE_MAP_MIN_PAIRS and all(
+        type(o) is int and type(n) is int and 0 <= o <= _INT32_MAX and 0 <= n <= _INT32_MAX
+        for o, n in pairs
+    ):
+        return _SortedLineMap(pairs)
+    return dict(pairs)
+
+
+def _build_file_line_mapping(
+    diff_ir: Dict[str, Any],
+    file_paths: Optional[set[str]] = None,
+) -> Dict[str, Any]:
     """
     Build a mapping from file paths to their diff hunks with touched line sets.
 
+    If ``file_paths`` is given, only those files are mapped (and validated);
+    files no issue points at are skipped.
+
     Returns structure:
     {
         "file_path": {
             "hunks": [...],
-            "touched_new_lines": set(int),  # RIGHT side lines that can be commented on
-            "old_to_new": dict(old_lineno -> new_lineno),  # Mapping for modified code
+            "touched_new_lines": frozenset(int),  # RIGHT side lines that can be commented on
+            "touched_sorted": list(int),  # touched_new_lines in ascending order
+            "old_to_new": dict(old_lineno -> new_lineno),  # Mapping for modified code,
+                                                           # a _SortedLineMap for large files
         }
     }
     """
@@ -351,10 +435,13 @@ def _build_file_line_mapping(diff_ir: Dict[str, Any]) -> Dict[str, Any]:
         file_path = file_entry.get("file_path")
         if not file_path:
             continue
+        if file_paths is not None and file_path not in file_paths:
+            continue
 
         hunks = file_entry.get("hunks", [])
-        touched_new_lines = set()
-        old_to_new = {}
+        # Collected as lists and converted once per file
+        touched = []
+        old_new_pairs = []
 
         for hunk in hunks:
             total_hunks += 1
@@ -376,16 +463,19 @@ def _build_file_line_mapping(diff_ir: Dict[str, Any]) -> Dict[str, Any]:
 
                 # RIGHT side commentable lines: add or context with new_lineno
                 if new_ln is not None and line_type in ("add", "context"):
-                    touched_new_lines.add(new_ln)
+                    touched.append(new_ln)
 
                 # old->new mapping: only record if both sides have line numbers
                 if old_ln is not None and new_ln is not None:
-                    old_to_new[old_ln] = new_ln
+                    old_new_pairs.append((old_ln, new_ln))
 
+        touched_new_lines = frozenset(touched)
         mapping[file_path] = {
             "hunks": hunks,
             "touched_new_lines": touched_new_lines,
-            "old_to_new": old_to_new,
+            # Lines arrive in ascending order, which sorted() handles in one pass
+            "touched_sorted": sorted(touched if len(touched) == len(touched_new_lines) else touched_new_lines),
+            "old_to_new": _line_map(old_new_pairs),
         }
 
     # Log validation summary
@@ -402,6 +492,63 @@ def _build_file_line_mapping(diff_ir: Dict[str, Any]) -> Dict[str, Any]:
     return mapping
 
 
+def _select_comments(
+    comments: List[Dict[str, Any]],
+    positions: Dict[str, set],
+    max_comments: int,
+) -> List[Dict[str, Any]]:
+    """
+    Keep up to ``max_comments`` commentable, non-duplicate inline comments, in order.
+
+    A comment is dropped if its line or start_line is not commentable in the
+    diff: GitHub rejects the whole review ("could not be resolved") if any
+    comment points outside the diff, so validating locally avoids re-posting
+    the review without comments. Comments with the same file, line range and
+    body opening are duplicates. Stops scanning once the cap is reached.
+    """
+    kept = []
+    seen = set()
+    outside = 0
+    for comment in comments:
+        lines = positions.get(comment.get("path"))
+        start_line = comment.get("start_line")
+        if (
+            not lines
+            or comment.get("line") not in lines
+            or (start_line is not None and start_line not in lines)
+        ):
+            outside += 1
+            continue
+
+        key = (
+            comment["path"],
+            start_line,
+            comment.get("line"),
+            comment["body"][:50],  # First 50 chars as signature
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append(comment)
+        if len(kept) == max_comments:
+            logger.info(f"Truncated inline comments to {max_comments}")
+            break
+
+    if outside:
+        logger.info(f"Skipped {outside} inline comments outside the PR diff")
+    return kept
+
+
+def _review_payload(body_json: bytes, event: str, comments: List[Dict[str, Any]]) -> bytes:
+    """Assemble a create-review request body around an already encoded review body."""
+    return b"".join([
+        b'{"body":', body_json,
+        b',"event":', json_dumps(event),
+        b',"comments":', json_dumps(comments),
+        b"}",
+    ])
+
+
 def _resolve_review_line(
     file_mapping: Dict[str, Any],
     line_start: int,
@@ -426,22 +573,39 @@ def _resolve_review_line(
         Dict with "line" (single-line) or "start_line"+"line" (multi-line), or None
     """
     touched = file_mapping.get("touched_new_lines", set())
+    touched_sorted = file_mapping.get("touched_sorted")
+    if touched_sorted is None:
+        touched_sorted = sorted(touched)
     old_to_new = file_mapping.get("old_to_new", {})
 
     def nearest_touched(target: int) -> Optional[int]:
-        """Find nearest touched line to target."""
+        """Find nearest touched line to target; the lower one wins a tie."""
         if target in touched:
             return target
-        for d in range(1, search_radius + 1):
-            if (target - d) in touched:
-                return target - d
-            if (target + d) in touched:
-                return target + d
+        i = bisect_left(touched_sorted, target)
+        below = touched_sorted[i - 1] if i > 0 else None
+        above = touched_sorted[i] if i < len(touched_sorted) else None
+        if below is not None and target - below <= search_radius and (
+            above is None or target - below <= above - target
+        ):
+            return below
+        if above is not None and above - target <= search_radius:
+            return above
         return None
 
+    multi_line = bool(line_end) and line_end != line_start
+
+    # Fast path: the issue's lines are commentable as they are
+    if line_start in touched:
+        if not multi_line:
+            return {"line": line_start}
+        if line_end in touched:
+            if line_end < line_start:
+                return {"start_line": line_end, "line": line_start}
+            return {"start_line": line_start, "line": line_end}
+
     # ① Assume new line (most common case for issues in PR code)
     start_new = nearest_touched(line_start)
-    end_new = None
 
     # ② Fallback: assume old line (for issues referencing base code)
     if start_new is None:
@@ -453,7 +617,7 @@ def _resolve_review_line(
         return None
 
     # Handle multi-line comments
-    if line_end and line_end != line_start:
+    if multi_line:
         end_candidate = nearest_touched(line_end)
         if end_candidate is None:
             # Try mapping line_end as old line
@@ -479,25 +643,39 @@ def _convert_issue_to_inline_comment(
     issue_obj: Dict[str, Any],
     file_line_mapping: Dict[str, Any],
     issue_type: str,
-) -> List[Dict[str, Any]]:
+    meta: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Convert a single issue object to GitHub inline comment format.
 
+    The issue's location is resolved first, so no comment body is built for
+    issues that can't be placed in the diff.
+
     Args:
-        issue_obj: Issue dict containing location, description, etc. (with _meta attached)
+        issue_obj: Issue dict containing description, severity, etc.
         file_line_mapping: Line mapping from _build_file_line_mapping
         issue_type: "Logic" or "Security"
+        meta: The issue's location entry; defaults to issue_obj["_meta"]
 
     Returns:
-        List of inline comment dicts (may return multiple if issue spans multiple lines)
+        Inline comment dict (a multi-line comment carries start_line), or None
+        if the issue can't be placed in the diff
     """
-    comments = []
-    meta = issue_obj.get("_meta", {})
+    # Get issue location from _meta
+    # _meta can be:
+    #   1. Object with hunk_id: {hunk_id, file_path, risk_score}  (Logic/Security Agent + AI analysis)
+    #   2. Object with line numbers: {file_path, line_start, line_end}  (deprecated array format entries)
+    if meta is None:
+        meta = issue_obj.get("_meta", {})
     file_path = meta.get("file_path")
 
     if not file_path or file_path not in file_line_mapping:
         logger.warning(f"File path not found in diff: {file_path}")
-        return []
+        return None
+
+    location = _locate_issue(issue_obj, meta, file_path, file_line_mapping[file_path])
+    if location is None:
+        return None
 
     # Build comment body
     severity = issue_obj.get("severity", "unknown").upper()
@@ -507,36 +685,34 @@ def _convert_issue_to_inline_comment(
     suggestion = issue_obj.get("suggestion", "")
     trigger_condition = issue_obj.get("trigger_condition", "")
 
-    body_lines = [
-        f"**{issue_type} Issue - {severity}**",
-        "",
-    ]
-
-    if category:
-        body_lines.append(f"**Category:** {category}")
-
-    body_lines.append(f"**{title}**")
-    body_lines.append("")
-
-    if description:
-        body_lines.append(f"**Description:** {description}")
-        body_lines.append("")
+    body = "".join((
+        f"**{issue_type} Issue - {severity}**\n\n",
+        f"**Category:** {category}\n" if category else "",
+        f"**{title}**\n",
+        f"\n**Description:** {description}\n" if description else "",
+        f"\n**Trigger:** {trigger_condition}\n" if trigger_condition else "",
+        f"\n**Suggestion:** {suggestion}\n" if suggestion else "",
+    ))
 
-    if trigger_condition:
-        body_lines.append(f"**Trigger:** {trigger_condition}")
-        body_lines.append("")
+    return {
+        "path": file_path,
+        "body": body,
+        "side": "RIGHT",
+        **location,
+    }
 
-    if suggestion:
-        body_lines.append(f"**Suggestion:** {suggestion}")
-        body_lines.append("")
 
-    body = "\n".join(body_lines)
+def _locate_issue(
+    issue_obj: Dict[str, Any],
+    meta: Dict[str, Any],
+    file_path: str,
+    file_map: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """
+    Resolve an issue's _meta to comment location fields (line, start_line, ...).
 
-    # Get issue location from _meta
-    # _meta can be:
-    #   1. Object with hunk_id: {hunk_id, file_path, risk_score}  (Logic/Security Agent + AI analysis)
-    #   2. Object with line numbers: {file_path, line_start, line_end}  (deprecated array format entries)
-    meta = issue_obj.get("_meta", {})
+    Returns None, after logging why, if the issue can't be placed in the diff.
+    """
     hunk_id = meta.get("hunk_id")
 
     # Strategy 1: Use hunk_id to find exact line numbers (preferred method)
@@ -544,7 +720,6 @@ def _convert_issue_to_inline_comment(
         logger.debug(f"Processing issue with hunk_id: {hunk_id} in {file_path}")
 
         # Find the hunk in the file mapping
-        file_map = file_line_mapping.get(file_path, {})
         hunks = file_map.get("hunks", [])
 
         target_hunk = None
@@ -558,7 +733,7 @@ def _convert_issue_to_inline_comment(
                 f"Hunk ID {hunk_id} not found in file {file_path}. "
                 f"Available hunks: {[h.get('hunk_id') for h in hunks[:5]]}"
             )
-            return []
+            return None
 
         # Extract line numbers from hunk metadata
         # Use new_start for RIGHT side positioning
@@ -567,22 +742,17 @@ def _convert_issue_to_inline_comment(
 
         if new_start is None:
             logger.warning(f"Hunk {hunk_id} has no new_start for {file_path}")
-            return []
+            return None
 
-        # Build comment dict with hunk location
-        comment = {
-            "path": file_path,
-            "body": body,
-            "side": "RIGHT",
+        location = {
             "start_line": new_start,
             "line": new_start + new_count - 1,  # End of hunk
         }
 
         logger.debug(
-            f"  → Hunk-based comment from {comment['start_line']} to {comment['line']}"
+            f"  → Hunk-based comment from {location['start_line']} to {location['line']}"
         )
-        comments.append(comment)
-        return comments
+        return location
 
     # Strategy 2: Use line_start/line_end directly (fallback for deprecated format)
     line_start = meta.get("line_start")
@@ -593,20 +763,23 @@ def _convert_issue_to_inline_comment(
             f"No hunk_id or line_start found for issue in {file_path}. "
             f"Meta: {meta}, Issue keys: {list(issue_obj.keys())}"
         )
-        return []
+        return None
 
-    # Ensure line numbers are integers
+    # Ensure line numbers are integers; they usually already are, coming from JSON
     try:
-        line_start = int(line_start)
-        line_end = int(line_end) if line_end is not None else line_start
+        if type(line_start) is not int:
+            line_start = int(line_start)
+        if line_end is None:
+            line_end = line_start
+        elif type(line_end) is not int:
+            line_end = int(line_end)
     except (ValueError, TypeError):
         logger.warning(f"Invalid line number format in meta: {meta}")
-        return []
+        return None
 
     logger.debug(f"Processing issue at {file_path}:{line_start}-{line_end}")
 
     # Resolve review line(s) using the improved strategy
-    file_map = file_line_mapping[file_path]
     resolved = _resolve_review_line(
         file_mapping=file_map,
         line_start=line_start,
@@ -619,96 +792,20 @@ def _convert_issue_to_inline_comment(
             f"File has {len(file_map.get('touched_new_lines', set()))} touched lines: "
             f"{sorted(list(file_map.get('touched_new_lines', set())))[:10]}..."
         )
-        return []
-
-    # Build comment dict with support for multi-line comments
-    comment = {
-        "path": file_path,
-        "body": body,
-        "side": "RIGHT",
-    }
+        return None
 
     # Single-line comment
     if "start_line" not in resolved:
-        comment["line"] = resolved["line"]
         logger.debug(f"  → Single-line comment at line {resolved['line']}")
-    else:
-        # Multi-line comment: "Comment on lines +x to +y"
-        comment["start_line"] = resolved["start_line"]
-        comment["line"] = resolved["line"]
-        comment["start_side"] = "RIGHT"
-        logger.debug(f"  → Multi-line comment from {resolved['start_line']} to {resolved['line']}")
-
-    comments.append(comment)
-
-    return comments
-
-
-def _find_line_in_pr_diff(
-    file_path: str,
-    issue_line: int,
-    file_info: Dict[str, Any],
-) -> Optional[int]:
-    """
-    Map an issue line number to the PR diff line number (RIGHT side).
-
-    This function handles two cases:
-    1. Modified/deleted code: Maps old line numbers to new line numbers
-    2. Added code: Returns the new line number directly
-
-    Args:
-        file_path: Path to the file
-        issue_line: Line number from the issue (could be old or new)
-        file_info: File info from _build_file_line_mapping
-
-    Returns:
-        The new line number in the PR's RIGHT side, or None if not found
-    """
-    # First, check if issue_line is a newly added line (type: "add")
-    # This means the issue is in the PR's new code
-    for hunk in file_info.get("hunks", []):
-        new_start = hunk.get("new_start", 0)
-        new_end = new_start + hunk.get("new_count", 0)
-
-        # Check if issue_line is within this hunk's new range
-        if new_start <= issue_line < new_end:
-            # Verify this is an added line by checking the line entries
-            for line_entry in hunk.get("lines", []):
-                if line_entry.get("new_lineno") == issue_line and line_entry.get("type") == "add":
-                    # This is newly added code, return the line as-is
-                    return issue_line
-
-    # If not found in new lines, try to map from old line to new line
-    # This handles issues in modified/deleted code
-    for hunk in file_info.get("hunks", []):
-        old_start = hunk.get("old_start", 0)
-        old_count = hunk.get("old_count", 0)
-        new_start = hunk.get("new_start", 0)
-
-        # Check if the issue line falls within this hunk's old range
-        if old_start <= issue_line < old_start + old_count:
-            # Search through lines in this hunk to find the exact match
-            for line_entry in hunk.get("lines", []):
-                if line_entry.get("old_lineno") == issue_line:
-                    # Found the line! Return its new line number
-                    new_lineno = line_entry.get("new_lineno")
-                    if new_lineno is not None:
-                        return new_lineno
-
-            # If we didn't find an exact match, estimate based on offset
-            offset = issue_line - old_start
-            return new_start + offset
-
-    # If we couldn't find it in any hunk's old range, try direct line entry lookup
-    # This handles context lines that flow through
-    for hunk in file_info.get("hunks", []):
-        for line_entry in hunk.get("lines", []):
-            if line_entry.get("old_lineno") == issue_line:
-                new_lineno = line_entry.get("new_lineno")
-                if new_lineno is not None:
-                    return new_lineno
-
-    return None
+        return {"line": resolved["line"]}
+
+    # Multi-line comment: "Comment on lines +x to +y"
+    logger.debug(f"  → Multi-line comment from {resolved['start_line']} to {resolved['line']}")
+    return {
+        "start_line": resolved["start_line"],
+        "line": resolved["line"],
+        "start_side": "RIGHT",
+    }
 
 
 def _generate_functional_summary_body(functional_summary: Dict[str, Any], pr_info: Dict[str, Any]) -> str:
@@ -788,6 +885,17 @@ def _generate_functional_summary_body(functional_summary: Dict[str, Any], pr_inf
     return "\n".join(lines)
 
 
+# Static parts of the comprehensive review body
+_REPORT_SUMMARY_HEADER = "### 📊 Summary\n\n| Metric | Value |\n|--------|-------|"
+_REPORT_FOOTER = "\n---\n*Generated by WiseCodeWatchers Comprehensive Workflow*"
+_RECOMMENDATIONS = {
+    "clean": "✅ No significant issues found. Ready to merge.",
+    "security": "🔴 **Security issues detected.** Please review and address before merging.",
+    "logic": "🟡 **Multiple logic issues found.** Consider reviewing before merging.",
+    "minor": "🟢 Minor issues found. Review recommended.",
+}
+
+
 def _generate_comprehensive_report_body(final_report: Dict[str, Any]) -> str:
     """Generate GitHub review body from comprehensive workflow report."""
     lines = ["## 🔍 WiseCodeWatchers Comprehensive Review\n"]
@@ -808,9 +916,7 @@ def _generate_comprehensive_report_body(final_report: Dict[str, Any]) -> str:
     security_issues = security_review.get("issues_found", 0)
     total_issues = logic_issues + security_issues
 
-    lines.append("### 📊 Summary\n")
-    lines.append(f"| Metric | Value |")
-    lines.append(f"|--------|-------|")
+    lines.append(_REPORT_SUMMARY_HEADER)
     lines.append(f"| Logic Issues | {logic_issues} |")
     lines.append(f"| Security Issues | {security_issues} |")
     lines.append(f"| **Total Issues** | **{total_issues}** |")
@@ -826,8 +932,8 @@ def _generate_comprehensive_report_body(final_report: Dict[str, Any]) -> str:
     # Logic Issues
     if logic_issues > 0:
         lines.append("### 🧠 Logic Issues\n")
-        for issue in logic_review.get("issues", [])[:10]:
-            issue_data = issue.get("issue", {})
+        for issue in islice(logic_review.get("issues") or (), 10):
+            issue_data = issue.get("issue")
             if issue_data:
                 severity = issue_data.get("severity", "unknown").upper()
                 title = issue_data.get("title", "Unknown issue")
@@ -845,8 +951,8 @@ def _generate_comprehensive_report_body(final_report: Dict[str, Any]) -> str:
     # Security Issues
     if security_issues > 0:
         lines.append("### 🔒 Security Issues\n")
-        for issue in security_review.get("issues", [])[:10]:
-            issue_data = issue.get("issue", {})
+        for issue in islice(security_review.get("issues") or (), 10):
+            issue_data = issue.get("issue")
             if issue_data:
                 severity = issue_data.get("severity", "unknown").upper()
                 title = issue_data.get("title", "Unknown vulnerability")
@@ -874,36 +980,94 @@ def _generate_comprehensive_report_body(final_report: Dict[str, Any]) -> str:
     review_summary = final_report.get("review_summary", {})
     recommendation = review_summary.get("recommendation", "needs_review")
     if total_issues == 0:
-        lines.append("✅ No significant issues found. Ready to merge.")
+        lines.append(_RECOMMENDATIONS["clean"])
     elif security_issues > 0:
-        lines.append("🔴 **Security issues detected.** Please review and address before merging.")
+        lines.append(_RECOMMENDATIONS["security"])
     elif logic_issues > 3:
-        lines.append("🟡 **Multiple logic issues found.** Consider reviewing before merging.")
+        lines.append(_RECOMMENDATIONS["logic"])
     else:
-        lines.append("🟢 Minor issues found. Review recommended.")
+        lines.append(_RECOMMENDATIONS["minor"])
 
-    lines.append("\n---\n*Generated by WiseCodeWatchers Comprehensive Workflow*")
+    lines.append(_REPORT_FOOTER)
 
     return "\n".join(lines)
 
 
+def _decide_event(
+    *,
+    critical: int = 0,
+    high: int = 0,
+    security_issues: int = 0,
+    logic_issues: int = 0,
+) -> str:
+    """
+    Review event for the given issue counts: REQUEST_CHANGES for any critical
+    bug or security issue, or more than three high bugs or logic issues.
+    """
+    if critical > 0 or high > 3 or security_issues > 0 or logic_issues > 3:
+        return "REQUEST_CHANGES"
+    return "COMMENT"
+
+
+def _review_event_for(report: AnalysisReport) -> str:
+    """Review event for an AnalysisReport, from its bug severities."""
+    if not report.bug_detection.has_bugs:
+        return "COMMENT"
+    by_severity = report.bug_detection.by_severity
+    return _decide_event(
+        critical=by_severity.get("critical", 0),
+        high=by_severity.get("high", 0),
+    )
+
+
 class GitHubPublisher:
     def __init__(self, github_client):
         self.client = github_client
         self.report_generator = ReportGenerator()
-        self._pr_files_cache = {}
+        # (diff_ir, mapped paths, mapping) of the last comprehensive report
+        self._line_mapping_cache = None
+
+    def _get_file_line_mapping(
+        self,
+        final_report: Dict[str, Any],
+        diff_ir: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Line mapping for the files ``final_report`` references, reused across calls."""
+        paths = _referenced_file_paths(final_report)
+        cached = self._line_mapping_cache
+        if cached is not None and cached[0] is diff_ir and paths <= cached[1]:
+            return cached[2]
+
+        mapping = _build_file_line_mapping(diff_ir, paths)
+        self._line_mapping_cache = (diff_ir, paths, mapping)
+        return mapping
+
+    def _get_pr_files(self, repo_full_name: str, pr_number: int) -> frozenset[str]:
+        """
+        Get set of file paths that are in the PR diff.
 
-    def _get_pr_files(self, repo_full_name: str, pr_number: int) -> set[str]:
-        """Get set of file paths that are in the PR diff."""
-        cache_key = f"{repo_full_name}#{pr_number}"
-        if cache_key not in self._pr_files_cache:
+        Cached for a minute across publisher instances (one is created per
+        request) and keyed by client, so publishing twice for the same PR
+        costs one API call. Failed lookups are not cached.
+        """
+        cache_key = (id(self.client), repo_full_name, pr_number)
+        pr_files = _PR_FILES_CACHE.get(cache_key)
+        if pr_files is None:
             try:
                 files = self.client.get_pr_files_changed(repo_full_name, pr_number)
-                self._pr_files_cache[cache_key] = {f["filename"] for f in files}
             except Exception as e:
                 logger.warning(f"Failed to get PR files: {e}")
-                self._pr_files_cache[cache_key] = set()
-        return self._pr_files_cache[cache_key]
+                return frozenset()
+            pr_files = frozenset(f["filename"] for f in files)
+            _PR_FILES_CACHE.set(cache_key, pr_files)
+        return pr_files
+
+    def _get_line_comments(self, report: AnalysisReport) -> List[Dict[str, Any]]:
+        """Line comments for files actually in the PR diff."""
+        pr_files = self._get_pr_files(report.repo_full_name, report.pr_number)
+        comments = self.report_generator.generate_line_comments(report, allowed_paths=pr_files)
+        logger.info(f"Line comments in PR files: {len(comments)} (files in PR: {len(pr_files)})")
+        return comments
 
     async def publish_review(
         self,
@@ -941,17 +1105,9 @@ class GitHubPublisher:
     ) -> dict:
         comments = []
         if include_line_comments:
-            all_comments = self.report_generator.generate_line_comments(report)
-            pr_files = self._get_pr_files(report.repo_full_name, report.pr_number)
-            comments = [c for c in all_comments if c.get("path") in pr_files]
-            logger.info(f"Filtered comments: {len(comments)}/{len(all_comments)} (files in PR: {len(pr_files)})")
-
-        event = "COMMENT"
-        if report.bug_detection.has_bugs:
-            critical_count = report.bug_detection.by_severity.get("critical", 0)
-            high_count = report.bug_detection.by_severity.get("high", 0)
-            if critical_count > 0 or high_count > 3:
-                event = "REQUEST_CHANGES"
+            comments = self._get_line_comments(report)
+
+        event = _review_event_for(report)
 
         self.client.create_review(
             repo_full_name=report.repo_full_name,
@@ -996,18 +1152,9 @@ class GitHubPublisher:
             if as_review:
                 comments = []
                 if include_line_comments:
-                    all_comments = self.report_generator.generate_line_comments(report)
-                    # Filter comments to only include files actually in the PR diff
-                    pr_files = self._get_pr_files(report.repo_full_name, report.pr_number)
-                    comments = [c for c in all_comments if c.get("path") in pr_files]
-                    logger.info(f"Filtered comments: {len(comments)}/{len(all_comments)} (files in PR: {len(pr_files)})")
-
-                event = "COMMENT"
-                if report.bug_detection.has_bugs:
-                    critical_count = report.bug_detection.by_severity.get("critical", 0)
-                    high_count = report.bug_detection.by_severity.get("high", 0)
-                    if critical_count > 0 or high_count > 3:
-                        event = "REQUEST_CHANGES"
+                    comments = self._get_line_comments(report)
+
+                event = _review_event_for(report)
 
                 try:
                     self.client.create_review(
@@ -1080,61 +1227,43 @@ class GitHubPublisher:
             logic_issues = final_report.get("logic_review", {}).get("issues_found", 0)
             security_issues = final_report.get("security_review", {}).get("issues_found", 0)
 
-            event = "COMMENT"
-            if security_issues > 0:
-                event = "REQUEST_CHANGES"
-            elif logic_issues > 3:
-                event = "REQUEST_CHANGES"
+            event = _decide_event(security_issues=security_issues, logic_issues=logic_issues)
 
             # Extract inline comments from issues if diff_ir is provided
             inline_comments = []
             if diff_ir:
+                # Built once, for referenced files only, and shared by issue
+                # resolution and position checks
+                file_line_mapping = self._get_file_line_mapping(final_report, diff_ir)
+                positions = {
+                    path: file_map["touched_new_lines"]
+                    for path, file_map in file_line_mapping.items()
+                }
+
                 inline_comments = _extract_inline_comments_from_issues(
-                    final_report, diff_ir
+                    final_report, diff_ir, file_line_mapping
                 )
 
-                # Filter comments to only include files actually in the PR
-                pr_files = self._get_pr_files(repo_full_name, pr_number)
-                inline_comments = [
-                    c for c in inline_comments if c.get("path") in pr_files
-                ]
-
-                # Deduplicate comments (same file, line range, and similar body)
-                seen = set()
-                deduped = []
-                for c in inline_comments:
-                    key = (
-                        c["path"],
-                        c.get("start_line"),
-                        c.get("line"),
-                        c["body"][:50],  # First 50 chars as signature
-                    )
-                    if key not in seen:
-                        seen.add(key)
-                        deduped.append(c)
-                inline_comments = deduped
-
-                # Limit to max 20 comments (GitHub UX best practice)
-                max_comments = 20
-                if len(inline_comments) > max_comments:
-                    inline_comments = inline_comments[:max_comments]
-                    logger.info(
-                        f"Truncated inline comments to {max_comments} (had {len(deduped)})"
-                    )
+                # Keep only comments on lines of files in the PR diff, so GitHub
+                # doesn't reject the review, without duplicates and at most
+                # 20 of them (GitHub UX best practice)
+                inline_comments = _select_comments(
+                    inline_comments, positions, max_comments=20
+                )
 
                 logger.info(
                     f"Generated {len(inline_comments)} inline comments "
                     f"from {logic_issues + security_issues} issues"
                 )
 
-            # Publish the review with inline comments
+            # Publish the review with inline comments. The (large) body is
+            # encoded once and reused if the request has to be retried.
+            body_json = json_dumps(body)
             try:
-                self.client.create_review(
-                    repo_full_name=repo_full_name,
-                    pr_number=pr_number,
-                    body=body,
-                    event=event,
-                    comments=inline_comments,
+                self.client.create_review_raw(
+                    repo_full_name,
+                    pr_number,
+                    _review_payload(body_json, event, inline_comments),
                 )
 
                 return {
@@ -1146,18 +1275,17 @@ class GitHubPublisher:
                     "inline_comments_count": len(inline_comments),
                 }
             except Exception as e:
-                # If inline comments fail (e.g., line resolution errors), retry without them
+                # Last resort: comments are validated above, but if GitHub still
+                # can't resolve a line, retry without them
                 if "could not be resolved" in str(e).lower() and inline_comments:
                     logger.warning(
                         f"Inline comments failed due to line resolution errors. "
                         f"Retrying review without inline comments. Error: {e}"
                     )
-                    self.client.create_review(
-                        repo_full_name=repo_full_name,
-                        pr_number=pr_number,
-                        body=body,
-                        event=event,
-                        comments=[],  # Retry without inline comments
+                    self.client.create_review_raw(
+                        repo_full_name,
+                        pr_number,
+                        _review_payload(body_json, event, []),  # Retry without inline comments
                     )
 
                     return {
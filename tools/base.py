@@ -2,8 +2,12 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional
 
+# Seconds an availability probe (e.g. "tool --version") may take; a hung or
+# broken install counts as unavailable
+PROBE_TIMEOUT = 10
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolResult:
     success: bool
     output: str
@@ -16,10 +20,25 @@ class BaseTool(ABC):
     name: str
     description: str
 
+    # Probe results per tool class; the installed binaries don't change mid-process
+    _availability: dict[type, bool] = {}
+
     @abstractmethod
     async def run(self, target: str, **kwargs) -> ToolResult:
         pass
 
     @abstractmethod
-    def is_available(self) -> bool:
+    def _probe_available(self) -> bool:
         pass
+
+    def is_available(self) -> bool:
+        cls = type(self)
+        available = BaseTool._availability.get(cls)
+        if available is None:
+            available = self._probe_available()
+            BaseTool._availability[cls] = available
+        return available
+
+    @classmethod
+    def invalidate_availability_cache(cls) -> None:
+        BaseTool._availability.clear()
@@ -1,11 +1,21 @@
 import json
 import os
+import shutil
+import sys
 import asyncio
-from typing import Optional
+import weakref
+from typing import Callable, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 
+from core.file_index import PRUNED_DIRS
 from tools.base import BaseTool, ToolResult
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 # Memory/Resource leak related rules by linter
 MEMORY_CHECK_RULES = {
@@ -60,18 +70,254 @@ MEMORY_CHECK_RULES = {
 }
 
 
+# Memory rules as prefix tuples, matched with a single str.startswith call
+_MEMORY_RULE_PREFIXES = {
+    linter: tuple(rules) for linter, rules in MEMORY_CHECK_RULES.items()
+}
+
+
+# Rule groups ("bundles") passed to linters that accept rule selection.
+# Only enabled bundles are selected, so disabled groups cost no linter time.
+LINT_RULE_BUNDLES = {
+    "ruff": {
+        "syntax": ("E", "F"),
+        "style": ("W",),
+        "memory": ("B", "SIM", "PLR", "PLW", "RUF"),
+        "security": ("S",),
+    },
+    "golangci-lint": {
+        "syntax": ("govet",),
+        "memory": ("bodyclose", "sqlclosecheck", "rowserrcheck", "ineffassign"),
+        "security": ("gosec",),
+    },
+}
+
+
 @dataclass
 class LinterConfig:
     """Configuration for enhanced linting with memory checks."""
     enable_memory_checks: bool = True
     strict_mode: bool = False
     extra_rules: list = None
+    # Subset of "syntax", "memory", "security", "style"; None enables all
+    # bundles when memory checks are on. The memory bundle always follows
+    # enable_memory_checks.
+    enabled_bundles: Optional[set[str]] = None
     
     def __post_init__(self):
         if self.extra_rules is None:
             self.extra_rules = []
 
 
+@lru_cache(maxsize=4096)
+def _categorize_rule(rule: str, linter: str) -> str:
+    """
+    Categorize a linter rule as syntax, memory, security, or style.
+
+    Memoized: a PR reports the same few rules many times over.
+    """
+    # Check if rule is memory-related
+    if rule.startswith(_MEMORY_RULE_PREFIXES.get(linter, ())):
+        return "memory"
+
+    # Security rules by linter
+    if linter == "ruff" and rule.startswith("S"):
+        return "security"
+    if linter == "golangci-lint" and rule == "gosec":
+        return "security"
+    if linter == "eslint" and rule in (
+        "no-eval", "no-implied-eval", "no-new-func", "no-script-url"
+    ):
+        return "security"
+    if linter == "eslint" and rule.startswith("security/"):
+        return "security"
+    if linter == "checkstyle" and any(
+        x in rule for x in ("SQL", "XSS", "INJECTION", "XXE", "SSRF")
+    ):
+        return "security"
+    if linter == "rubocop" and rule.startswith("Security"):
+        return "security"
+
+    # Syntax errors - be precise, not all E/F codes are syntax errors
+    # Python (ruff/pylint)
+    if linter == "ruff":
+        # Only E9xx are actual runtime/syntax errors
+        if rule.startswith("E9"):
+            return "syntax"
+        # Specific F codes that are true errors
+        if rule in ("F821", "F822", "F823", "F831", "F632", "F633"):
+            return "syntax"
+    if linter == "pylint":
+        # E codes in pylint are actual errors
+        if rule.startswith("E"):
+            return "syntax"
+
+    # Go (golangci-lint)
+    if linter == "golangci-lint" and rule in ("govet", "typecheck", "staticcheck"):
+        return "syntax"
+
+    # TypeScript/JavaScript (eslint)
+    if linter == "eslint" and rule in (
+        "no-undef", "no-unreachable", "no-dupe-keys", "no-dupe-args",
+        "no-func-assign", "no-import-assign", "no-const-assign",
+        "valid-typeof", "no-obj-calls", "no-invalid-regexp"
+    ):
+        return "syntax"
+
+    # Java (checkstyle)
+    if linter == "checkstyle" and rule == "compiler":
+        return "syntax"
+
+    # Ruby (rubocop)
+    if linter == "rubocop" and rule.startswith("Lint/Syntax"):
+        return "syntax"
+    if linter == "rubocop" and rule in (
+        "Lint/Void", "Lint/UnreachableCode", "Lint/DuplicateMethods"
+    ):
+        return "syntax"
+
+    return "style"
+
+
+# Linter name -> executable probed for it
+LINTER_COMMANDS = {
+    "pylint": "pylint",
+    "flake8": "flake8",
+    "eslint": "eslint",
+    "ruff": "ruff",
+    "checkstyle": "checkstyle",
+    "spotbugs": "spotbugs",  # Better for Java memory checks
+    "golangci-lint": "golangci-lint",
+    "rubocop": "rubocop",
+}
+
+
+@lru_cache(maxsize=64)
+def _find_executable(name: str) -> Optional[str]:
+    """
+    Find executable in PATH or common venv locations.
+
+    Memoized: every LinterTool and every run looks up the same few names.
+    """
+    path = shutil.which(name)
+    if path:
+        return path
+    venv_bin = os.path.dirname(sys.executable)
+    venv_path = os.path.join(venv_bin, name)
+    if os.path.isfile(venv_path) and os.access(venv_path, os.X_OK):
+        return venv_path
+    return None
+
+
+@lru_cache(maxsize=1)
+def _detect_linters() -> dict[str, bool]:
+    return {
+        linter: _find_executable(cmd) is not None
+        for linter, cmd in LINTER_COMMANDS.items()
+    }
+
+
+def invalidate_linter_cache() -> None:
+    """Forget detected linters, e.g. after installing one or changing PATH."""
+    _find_executable.cache_clear()
+    _detect_linters.cache_clear()
+    # is_available() results are cached per tool class on top of the detection
+    BaseTool.invalidate_availability_cache()
+
+
+# File extension -> language passed to run_on_files
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".js": "typescript",
+    ".jsx": "typescript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".java": "java",
+    ".go": "go",
+    ".rb": "ruby",
+}
+
+
+def _first_language_in(root: str) -> str:
+    """
+    Language of the first recognised file under ``root``, or "unknown".
+
+    Top-down like os.walk (a directory's files before its subdirectories),
+    but with scandir and without descending into dot-directories or
+    PRUNED_DIRS, and stopping at the first hit.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name[0] != "." and name not in PRUNED_DIRS:
+                        subdirs.append(entry.path)
+                    continue
+                dot = name.rfind(".")
+                if dot > 0:
+                    language = LANGUAGE_BY_EXTENSION.get(name[dot:])
+                    if language:
+                        return language
+        stack.extend(reversed(subdirs))
+    return "unknown"
+
+
+# Linter subprocesses allowed to run at once per event loop; chunked and
+# per-language runs are gathered, so without a cap a big PR oversubscribes
+MAX_LINT_PROCESSES = os.cpu_count() or 4
+
+_process_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _process_slots() -> asyncio.Semaphore:
+    """The running loop's semaphore bounding linter subprocesses."""
+    loop = asyncio.get_running_loop()
+    sem = _process_semaphores.get(loop)
+    if sem is None:
+        sem = _process_semaphores[loop] = asyncio.Semaphore(MAX_LINT_PROCESSES)
+    return sem
+
+
+def _argv_budget() -> int:
+    """Bytes available for command-line arguments after the environment."""
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = 32 * 1024  # Windows command-line limit
+    # Each argument/variable also costs a pointer and a NUL terminator
+    env_size = sum(len(k) + len(v) + 10 for k, v in os.environ.items())
+    # Keep half as headroom: the limit is shared with the stack on some systems
+    return max(arg_max // 2 - env_size, 16 * 1024)
+
+
+def _argv_batches(cmd: list[str], files: list[str]) -> list[list[str]]:
+    """Split ``files`` into the fewest batches whose ``cmd + batch`` fits in argv."""
+    budget = _argv_budget() - sum(len(os.fsencode(arg)) + 9 for arg in cmd)
+    batches = []
+    batch = []
+    used = 0
+    for path in files:
+        size = len(os.fsencode(path)) + 9
+        if batch and used + size > budget:
+            batches.append(batch)
+            batch = []
+            used = 0
+        batch.append(path)
+        used += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 class LinterTool(BaseTool):
     name = "linter"
     description = "Run linting tools to check code style, memory leaks, and resource issues"
@@ -82,35 +328,29 @@ class LinterTool(BaseTool):
         self._available_linters = self._detect_linters()
 
     def _detect_linters(self) -> dict[str, bool]:
-        linters = {}
-        linter_cmds = {
-            "pylint": "pylint",
-            "flake8": "flake8",
-            "eslint": "eslint",
-            "ruff": "ruff",
-            "checkstyle": "checkstyle",
-            "spotbugs": "spotbugs",  # Better for Java memory checks
-            "golangci-lint": "golangci-lint",
-            "rubocop": "rubocop",
-        }
-        for linter, cmd in linter_cmds.items():
-            linters[linter] = self._find_executable(cmd) is not None
-        return linters
+        return dict(_detect_linters())
 
     def _find_executable(self, name: str) -> Optional[str]:
         """Find executable in PATH or common venv locations."""
-        import shutil
-        import sys
-        path = shutil.which(name)
-        if path:
-            return path
-        venv_bin = os.path.dirname(sys.executable)
-        venv_path = os.path.join(venv_bin, name)
-        if os.path.isfile(venv_path) and os.access(venv_path, os.X_OK):
-            return venv_path
-        return None
-
-    def is_available(self) -> bool:
+        return _find_executable(name)
+
+    def _bundle_rules(self, linter: str) -> list[str]:
+        """Rules to select for ``linter`` from the enabled bundles, in bundle order."""
+        bundles = self.config.enabled_bundles
+        if bundles is None:
+            if not self.config.enable_memory_checks:
+                return []
+            bundles = LINT_RULE_BUNDLES.get(linter, {}).keys()
+        elif not self.config.enable_memory_checks:
+            bundles = set(bundles) - {"memory"}
+        return [
+            rule
+            for bundle, rules in LINT_RULE_BUNDLES.get(linter, {}).items()
+            if bundle in bundles
+            for rule in rules
+        ]
+
+    def _probe_available(self) -> bool:
         return any(self._available_linters.values())
 
     def get_available_linters(self) -> dict[str, bool]:
@@ -154,30 +394,9 @@ class LinterTool(BaseTool):
 
     def _detect_language(self, path: str) -> str:
         if os.path.isfile(path):
-            ext = os.path.splitext(path)[1]
-            if ext in [".py"]:
-                return "python"
-            if ext in [".js", ".jsx", ".ts", ".tsx"]:
-                return "typescript"
-            if ext in [".java"]:
-                return "java"
-            if ext in [".go"]:
-                return "go"
-            if ext in [".rb"]:
-                return "ruby"
-        elif os.path.isdir(path):
-            for root, _, files in os.walk(path):
-                for file in files:
-                    if file.endswith(".py"):
-                        return "python"
-                    if file.endswith((".js", ".jsx", ".ts", ".tsx")):
-                        return "typescript"
-                    if file.endswith(".java"):
-                        return "java"
-                    if file.endswith(".go"):
-                        return "go"
-                    if file.endswith(".rb"):
-                        return "ruby"
+            return LANGUAGE_BY_EXTENSION.get(os.path.splitext(path)[1], "unknown")
+        if os.path.isdir(path):
+            return _first_language_in(path)
         return "unknown"
 
     async def run_on_files(self, files: list[str], language: str) -> ToolResult:
@@ -229,7 +448,7 @@ class LinterTool(BaseTool):
 
             issues = []
             try:
-                results = json.loads(output) if output.strip() else []
+                results = json_loads(output) if output.strip() else []
                 for item in results:
                     issues.append({
                         "file": item.get("path", ""),
@@ -260,7 +479,7 @@ class LinterTool(BaseTool):
 
             issues = []
             try:
-                results = json.loads(output) if output.strip() else []
+                results = json_loads(output) if output.strip() else []
                 for item in results:
                     issues.append({
                         "file": item.get("filename", ""),
@@ -291,7 +510,7 @@ class LinterTool(BaseTool):
 
             issues = []
             try:
-                results = json.loads(output) if output.strip() else []
+                results = json_loads(output) if output.strip() else []
                 for file_result in results:
                     for msg in file_result.get("messages", []):
                         issues.append({
@@ -324,44 +543,30 @@ class LinterTool(BaseTool):
         ruff_path = self._find_executable("ruff") or "ruff"
         cmd = [ruff_path, "check", "--output-format=json"]
         
-        # Enable extended rules for memory/resource checking
-        if self.config.enable_memory_checks:
+        # Select only the enabled rule bundles (memory/resource, security, ...)
+        rules = self._bundle_rules("ruff")
+        if rules:
             cmd.extend([
-                "--select=E,F,W,B,SIM,PLR,PLW,S,RUF",  # Extended rule sets
+                f"--select={','.join(rules)}",
                 "--ignore=E501",  # Ignore line length
             ])
         
-        cmd.extend(files)
-        
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
+        return await self._run_batched(cmd, files, self._parse_ruff)
 
-            issues = []
-            try:
-                results = json.loads(output) if output.strip() else []
-                for item in results:
-                    rule_code = item.get("code", "")
-                    issues.append({
-                        "file": item.get("filename", ""),
-                        "line": item.get("location", {}).get("row", 0),
-                        "column": item.get("location", {}).get("column", 0),
-                        "severity": self._get_ruff_severity(rule_code),
-                        "message": item.get("message", ""),
-                        "rule": rule_code,
-                        "category": self._categorize_issue(rule_code, "ruff"),
-                    })
-            except json.JSONDecodeError:
-                pass
-
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+    def _parse_ruff(self, output: str) -> list[dict]:
+        issues = []
+        for item in json_loads(output) if output.strip() else []:
+            rule_code = item.get("code", "")
+            issues.append({
+                "file": item.get("filename", ""),
+                "line": item.get("location", {}).get("row", 0),
+                "column": item.get("location", {}).get("column", 0),
+                "severity": self._get_ruff_severity(rule_code),
+                "message": item.get("message", ""),
+                "rule": rule_code,
+                "category": self._categorize_issue(rule_code, "ruff"),
+            })
+        return issues
 
     def _get_ruff_severity(self, rule_code: str) -> str:
         """Map ruff rule codes to severity levels."""
@@ -373,246 +578,150 @@ class LinterTool(BaseTool):
 
     def _categorize_issue(self, rule: str, linter: str) -> str:
         """Categorize issue as syntax, memory, security, or style."""
-        memory_rules = MEMORY_CHECK_RULES.get(linter, set())
-        
-        # Check if rule is memory-related
-        for mem_rule in memory_rules:
-            if rule.startswith(mem_rule) or rule == mem_rule:
-                return "memory"
-        
-        # Security rules by linter
-        if linter == "ruff" and rule.startswith("S"):
-            return "security"
-        if linter == "golangci-lint" and rule == "gosec":
-            return "security"
-        if linter == "eslint" and rule in (
-            "no-eval", "no-implied-eval", "no-new-func", "no-script-url"
-        ):
-            return "security"
-        if linter == "eslint" and rule.startswith("security/"):
-            return "security"
-        if linter == "checkstyle" and any(
-            x in rule for x in ("SQL", "XSS", "INJECTION", "XXE", "SSRF")
-        ):
-            return "security"
-        if linter == "rubocop" and rule.startswith("Security"):
-            return "security"
-        
-        # Syntax errors - be precise, not all E/F codes are syntax errors
-        # Python (ruff/pylint)
-        if linter == "ruff":
-            # Only E9xx are actual runtime/syntax errors
-            if rule.startswith("E9"):
-                return "syntax"
-            # Specific F codes that are true errors
-            if rule in ("F821", "F822", "F823", "F831", "F632", "F633"):
-                return "syntax"
-        if linter == "pylint":
-            # E codes in pylint are actual errors
-            if rule.startswith("E"):
-                return "syntax"
-        
-        # Go (golangci-lint)
-        if linter == "golangci-lint" and rule in ("govet", "typecheck", "staticcheck"):
-            return "syntax"
-        
-        # TypeScript/JavaScript (eslint)
-        if linter == "eslint" and rule in (
-            "no-undef", "no-unreachable", "no-dupe-keys", "no-dupe-args",
-            "no-func-assign", "no-import-assign", "no-const-assign",
-            "valid-typeof", "no-obj-calls", "no-invalid-regexp"
-        ):
-            return "syntax"
-        
-        # Java (checkstyle)
-        if linter == "checkstyle" and rule == "compiler":
-            return "syntax"
-        
-        # Ruby (rubocop)
-        if linter == "rubocop" and rule.startswith("Lint/Syntax"):
-            return "syntax"
-        if linter == "rubocop" and rule in (
-            "Lint/Void", "Lint/UnreachableCode", "Lint/DuplicateMethods"
-        ):
-            return "syntax"
-        
-        return "style"
+        return _categorize_rule(rule, linter)
 
     async def _run_pylint_files(self, files: list[str]) -> ToolResult:
         pylint_path = self._find_executable("pylint") or "pylint"
-        cmd = [pylint_path, "--output-format=json"] + files
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
-
-            issues = []
-            try:
-                results = json.loads(output) if output.strip() else []
-                for item in results:
-                    issues.append({
-                        "file": item.get("path", ""),
-                        "line": item.get("line", 0),
-                        "column": item.get("column", 0),
-                        "severity": self._map_pylint_severity(item.get("type", "")),
-                        "message": item.get("message", ""),
-                        "rule": item.get("symbol", ""),
-                    })
-            except json.JSONDecodeError:
-                pass
-
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+        cmd = [pylint_path, "--output-format=json"]
+        return await self._run_batched(cmd, files, self._parse_pylint)
+
+    def _parse_pylint(self, output: str) -> list[dict]:
+        return [
+            {
+                "file": item.get("path", ""),
+                "line": item.get("line", 0),
+                "column": item.get("column", 0),
+                "severity": self._map_pylint_severity(item.get("type", "")),
+                "message": item.get("message", ""),
+                "rule": item.get("symbol", ""),
+            }
+            for item in (json_loads(output) if output.strip() else [])
+        ]
 
     async def _run_eslint_files(self, files: list[str]) -> ToolResult:
         eslint_path = self._find_executable("eslint") or "eslint"
-        cmd = [eslint_path, "--format=json"] + files
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
+        cmd = [eslint_path, "--format=json"]
+        return await self._run_batched(cmd, files, self._parse_eslint)
 
-            issues = []
-            try:
-                results = json.loads(output) if output.strip() else []
-                for file_result in results:
-                    for msg in file_result.get("messages", []):
-                        issues.append({
-                            "file": file_result.get("filePath", ""),
-                            "line": msg.get("line", 0),
-                            "column": msg.get("column", 0),
-                            "severity": "error" if msg.get("severity") == 2 else "warning",
-                            "message": msg.get("message", ""),
-                            "rule": msg.get("ruleId", ""),
-                        })
-            except json.JSONDecodeError:
-                pass
-
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+    def _parse_eslint(self, output: str) -> list[dict]:
+        issues = []
+        for file_result in json_loads(output) if output.strip() else []:
+            for msg in file_result.get("messages", []):
+                issues.append({
+                    "file": file_result.get("filePath", ""),
+                    "line": msg.get("line", 0),
+                    "column": msg.get("column", 0),
+                    "severity": "error" if msg.get("severity") == 2 else "warning",
+                    "message": msg.get("message", ""),
+                    "rule": msg.get("ruleId", ""),
+                })
+        return issues
 
     async def _run_checkstyle(self, files: list[str]) -> ToolResult:
         checkstyle_path = self._find_executable("checkstyle") or "checkstyle"
-        cmd = [checkstyle_path, "-f", "json"] + files
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
+        cmd = [checkstyle_path, "-f", "json"]
+        return await self._run_batched(cmd, files, self._parse_checkstyle)
 
-            issues = []
-            try:
-                results = json.loads(output) if output.strip() else []
-                for file_result in results:
-                    filepath = file_result.get("filename", "")
-                    for error in file_result.get("errors", []):
-                        issues.append({
-                            "file": filepath,
-                            "line": error.get("line", 0),
-                            "column": error.get("column", 0),
-                            "severity": error.get("severity", "warning").lower(),
-                            "message": error.get("message", ""),
-                            "rule": error.get("source", ""),
-                        })
-            except json.JSONDecodeError:
-                pass
-
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+    def _parse_checkstyle(self, output: str) -> list[dict]:
+        issues = []
+        for file_result in json_loads(output) if output.strip() else []:
+            filepath = file_result.get("filename", "")
+            for error in file_result.get("errors", []):
+                issues.append({
+                    "file": filepath,
+                    "line": error.get("line", 0),
+                    "column": error.get("column", 0),
+                    "severity": error.get("severity", "warning").lower(),
+                    "message": error.get("message", ""),
+                    "rule": error.get("source", ""),
+                })
+        return issues
 
     async def _run_golangci_lint(self, files: list[str]) -> ToolResult:
         golangci_path = self._find_executable("golangci-lint") or "golangci-lint"
         cmd = [golangci_path, "run", "--out-format=json"]
         
-        # Enable memory/resource leak checking linters
-        if self.config.enable_memory_checks:
-            cmd.extend([
-                "--enable=bodyclose",      # HTTP response body not closed
-                "--enable=sqlclosecheck",  # SQL rows/stmt not closed
-                "--enable=rowserrcheck",   # SQL rows.Err() not checked
-                "--enable=gosec",          # Security issues
-                "--enable=ineffassign",    # Ineffectual assignments
-                "--enable=govet",          # Go vet checks
-            ])
+        # Enable the linters of each enabled bundle (memory/resource leaks, gosec, ...)
+        cmd.extend(f"--enable={rule}" for rule in self._bundle_rules("golangci-lint"))
         
         cmd.append("--")
-        cmd.extend(files)
-        
+        return await self._run_batched(cmd, files, self._parse_golangci_lint)
+
+    def _parse_golangci_lint(self, output: str) -> list[dict]:
+        issues = []
+        result = json_loads(output) if output.strip() else {}
+        for item in result.get("Issues", []):
+            pos = item.get("Pos", {})
+            rule = item.get("FromLinter", "")
+            issues.append({
+                "file": pos.get("Filename", ""),
+                "line": pos.get("Line", 0),
+                "column": pos.get("Column", 0),
+                "severity": item.get("Severity", "warning"),
+                "message": item.get("Text", ""),
+                "rule": rule,
+                "category": self._categorize_issue(rule, "golangci-lint"),
+            })
+        return issues
+
+    async def _run_rubocop(self, files: list[str]) -> ToolResult:
+        rubocop_path = self._find_executable("rubocop") or "rubocop"
+        cmd = [rubocop_path, "--format", "json"]
+        return await self._run_batched(cmd, files, self._parse_rubocop)
+
+    def _parse_rubocop(self, output: str) -> list[dict]:
+        issues = []
+        result = json_loads(output) if output.strip() else {}
+        for file_result in result.get("files", []):
+            filepath = file_result.get("path", "")
+            for offense in file_result.get("offenses", []):
+                loc = offense.get("location", {})
+                issues.append({
+                    "file": filepath,
+                    "line": loc.get("start_line", 0),
+                    "column": loc.get("start_column", 0),
+                    "severity": offense.get("severity", "warning"),
+                    "message": offense.get("message", ""),
+                    "rule": offense.get("cop_name", ""),
+                })
+        return issues
+
+    async def _run_batched(
+        self,
+        cmd: list[str],
+        files: list[str],
+        parse: Callable[[str], list[dict]],
+    ) -> ToolResult:
+        """
+        Run ``cmd`` over ``files`` and parse its JSON output with ``parse``.
+
+        Files are passed as arguments in as few invocations as fit the OS
+        argument-size limit (normally one); batches run concurrently and their
+        outputs and issues are merged in order.
+        """
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
+            outputs = await asyncio.gather(*(
+                self._communicate(cmd + batch) for batch in _argv_batches(cmd, files)
+            ))
+        except Exception as e:
+            return ToolResult(success=False, output="", error=str(e))
 
-            issues = []
+        issues = []
+        for output in outputs:
             try:
-                result = json.loads(output) if output.strip() else {}
-                for item in result.get("Issues", []):
-                    pos = item.get("Pos", {})
-                    rule = item.get("FromLinter", "")
-                    issues.append({
-                        "file": pos.get("Filename", ""),
-                        "line": pos.get("Line", 0),
-                        "column": pos.get("Column", 0),
-                        "severity": item.get("Severity", "warning"),
-                        "message": item.get("Text", ""),
-                        "rule": rule,
-                        "category": self._categorize_issue(rule, "golangci-lint"),
-                    })
+                issues.extend(parse(output))
             except json.JSONDecodeError:
                 pass
 
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+        return ToolResult(success=True, output="\n".join(outputs), issues=issues)
 
-    async def _run_rubocop(self, files: list[str]) -> ToolResult:
-        rubocop_path = self._find_executable("rubocop") or "rubocop"
-        cmd = [rubocop_path, "--format", "json"] + files
-        try:
+    @staticmethod
+    async def _communicate(cmd: list[str]) -> str:
+        async with _process_slots():
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
             stdout, stderr = await proc.communicate()
-            output = stdout.decode()
-
-            issues = []
-            try:
-                result = json.loads(output) if output.strip() else {}
-                for file_result in result.get("files", []):
-                    filepath = file_result.get("path", "")
-                    for offense in file_result.get("offenses", []):
-                        loc = offense.get("location", {})
-                        issues.append({
-                            "file": filepath,
-                            "line": loc.get("start_line", 0),
-                            "column": loc.get("start_column", 0),
-                            "severity": offense.get("severity", "warning"),
-                            "message": offense.get("message", ""),
-                            "rule": offense.get("cop_name", ""),
-                        })
-            except json.JSONDecodeError:
-                pass
-
-            return ToolResult(success=True, output=output, issues=issues)
-        except Exception as e:
-            return ToolResult(success=False, output="", error=str(e))
+        return stdout.decode()
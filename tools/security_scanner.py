@@ -1,29 +1,174 @@
 import subprocess
+import hashlib
 import json
 import os
 import asyncio
 import re
+import threading
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Optional
 
-from tools.base import BaseTool, ToolResult
+from core.cache import TTLCache
+from core.file_index import FileIndex
+from tools.base import PROBE_TIMEOUT, BaseTool, ToolResult
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# (pattern, message, severity, CWE) checks run on every source line. Written so
+# a long minified line can't make them backtrack: no nested quantifiers, and
+# runs stop at the character that ends them (e.g. [^)+]* before "+")
+SECURITY_PATTERNS = [
+    (re.compile(r"password\s*=\s*['\"][^'\"]+['\"]", re.IGNORECASE), "Hardcoded password detected", "critical", "CWE-259"),
+    (re.compile(r"api[_-]?key\s*=\s*['\"][^'\"]+['\"]", re.IGNORECASE), "Hardcoded API key detected", "critical", "CWE-798"),
+    (re.compile(r"secret\s*=\s*['\"][^'\"]+['\"]", re.IGNORECASE), "Hardcoded secret detected", "critical", "CWE-798"),
+    (re.compile(r"token\s*=\s*['\"][A-Za-z0-9]{20,}['\"]", re.IGNORECASE), "Possible hardcoded token", "high", "CWE-798"),
+    (re.compile(r"(?:os\.system|subprocess\.call)\s*\([^)+]*\+", re.IGNORECASE), "Possible command injection", "critical", "CWE-78"),
+    (re.compile(r"eval\s*\(", re.IGNORECASE), "Use of eval() - potential code injection", "high", "CWE-94"),
+    (re.compile(r"exec\s*\(", re.IGNORECASE), "Use of exec() - potential code injection", "high", "CWE-94"),
+    (re.compile(r"pickle\.loads?\s*\(", re.IGNORECASE), "Unsafe deserialization with pickle", "critical", "CWE-502"),
+    (re.compile(r"yaml\.load\s*\([^)]*\)(?!.*Loader)", re.IGNORECASE), "Unsafe YAML loading", "high", "CWE-502"),
+    (re.compile(r"verify\s*=\s*False", re.IGNORECASE), "SSL verification disabled", "high", "CWE-295"),
+    (re.compile(r"hashlib\.md5\s*\(", re.IGNORECASE), "Weak hash function MD5", "medium", "CWE-328"),
+    (re.compile(r"hashlib\.sha1\s*\(", re.IGNORECASE), "Weak hash function SHA1", "medium", "CWE-328"),
+    (re.compile(r"chmod\s*\(\s*['\"]?[0-689]*7\d*['\"]?\s*\)", re.IGNORECASE), "World-writable permissions", "medium", "CWE-732"),
+    (re.compile(r"debug\s*=\s*True", re.IGNORECASE), "Debug mode enabled", "low", "CWE-489"),
+]
+
+# Files per bandit invocation when scanning a PR's changed files
+BANDIT_BATCH_SIZE = 200
+
+# Source files the pattern scan reads
+PATTERN_SCAN_EXTENSIONS = (".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go")
+
+# Union of SECURITY_PATTERNS: most files and lines match none, so one scan rules them out
+_SECURITY_ANY = re.compile(
+    "|".join(f"(?:{p.pattern})" for p, _, _, _ in SECURITY_PATTERNS), re.IGNORECASE
+)
+
+
+def _compile_security_db():
+    """Compile SECURITY_PATTERNS into one Hyperscan database.
+
+    Prefilter mode accepts the lookahead Hyperscan can't match exactly, at the
+    cost of possible false positives, so candidate lines are confirmed with
+    ``re``. UTF-8/UCP mode keeps whitespace classes and caseless matching
+    the same as ``re`` on decoded text.
+    """
+    flags = (
+        hyperscan.HS_FLAG_PREFILTER
+        | hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.pattern.encode() for p, _, _, _ in SECURITY_PATTERNS],
+        ids=list(range(len(SECURITY_PATTERNS))),
+        elements=len(SECURITY_PATTERNS),
+        flags=[flags] * len(SECURITY_PATTERNS),
+    )
+    return db
+
+
+_SECURITY_DB = None
+if HYPERSCAN_AVAILABLE:
+    try:
+        _SECURITY_DB = _compile_security_db()
+    except Exception:
+        _SECURITY_DB = None
+
+# Hyperscan scratch space can't be shared by concurrent scans: one per thread
+_scan_state = threading.local()
+
+
+def _thread_scratch():
+    scratch = getattr(_scan_state, "scratch", None)
+    if scratch is None:
+        scratch = _scan_state.scratch = hyperscan.Scratch(_SECURITY_DB)
+    return scratch
+
+
+def _candidate_lines(data: bytes) -> list[tuple[int, str]]:
+    """(line number, line) pairs of a file's raw ``data`` that may match a security pattern.
+
+    Lines are decoded as UTF-8, dropping invalid bytes, and split on the
+    same boundaries as universal-newline text mode. With Hyperscan an
+    ASCII-only file is scanned without decoding it at all and only the
+    reported candidate lines are decoded; otherwise the union regex filters
+    each decoded line.
+    """
+    if _SECURITY_DB is None:
+        content = data.decode("utf-8", "ignore")
+        if not _SECURITY_ANY.search(content):
+            return []
+        search = _SECURITY_ANY.search
+        return [(i, line) for i, line in enumerate(_split_lines(content), 1) if search(line)]
+
+    if not data.isascii():
+        # Hyperscan's UTF-8 mode needs valid input
+        data = data.decode("utf-8", "ignore").encode("utf-8")
+
+    ends = []
+
+    def on_match(_id, _start, end, _flags, _context):
+        ends.append(end)
+
+    _SECURITY_DB.scan(data, match_event_handler=on_match, scratch=_thread_scratch())
+    if not ends:
+        return []
+
+    lines = data.splitlines(keepends=True)
+    line_ends = list(accumulate(map(len, lines)))
+    return [
+        (i + 1, lines[i].decode("utf-8").rstrip("\r\n"))
+        for i in sorted({bisect_right(line_ends, end - 1) for end in ends})
+    ]
+
+
+def _pattern_hits(data: bytes) -> list[tuple[int, int, str]]:
+    """(line number, SECURITY_PATTERNS index, snippet) for each pattern matching a line of ``data``."""
+    return [
+        (line_num, index, line.strip()[:100])
+        for line_num, line in _candidate_lines(data)
+        for index, (pattern, _, _, _) in enumerate(SECURITY_PATTERNS)
+        if pattern.search(line)
+    ]
+
+
+def _split_lines(content: str) -> list[str]:
+    """Split like universal-newline text mode: on \\n, \\r\\n and \\r only."""
+    return content.replace("\r\n", "\n").replace("\r", "\n").split("\n")
 
 
 class SecurityScannerTool(BaseTool):
     name = "security_scanner"
     description = "Scan code for security vulnerabilities"
 
+    _scan_cache = TTLCache(maxsize=4096, ttl=None)
+
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path
 
-    def is_available(self) -> bool:
+    def _probe_available(self) -> bool:
         try:
             subprocess.run(
                 ["bandit", "--version"],
                 capture_output=True,
                 check=True,
+                timeout=PROBE_TIMEOUT,
             )
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
     async def run(self, target: str, **kwargs) -> ToolResult:
@@ -37,22 +182,45 @@ class SecurityScannerTool(BaseTool):
         # Support scanning specific files only
         changed_files = kwargs.get("changed_files")
         
-        language = kwargs.get("language", self._detect_language(target))
+        language = kwargs.get("language")
+        if language is None:
+            # Detection may walk the whole tree; keep it off the event loop
+            language = await asyncio.to_thread(self._detect_language, target)
 
         if language == "python" and self.is_available():
+            if kwargs.get("both"):
+                # Bandit runs in a subprocess and the pattern scan in a thread, so they overlap
+                bandit_result, pattern_result = await asyncio.gather(
+                    self._run_bandit(target, changed_files=changed_files),
+                    self._run_pattern_scan(target, changed_files=changed_files),
+                )
+                return self._merge_results(bandit_result, pattern_result)
             return await self._run_bandit(target, changed_files=changed_files)
         else:
             return await self._run_pattern_scan(target, changed_files=changed_files)
 
+    @staticmethod
+    def _merge_results(*results: ToolResult) -> ToolResult:
+        failed = [r for r in results if not r.success]
+        return ToolResult(
+            success=not failed,
+            output="\n".join(r.output for r in results if r.output),
+            error=failed[0].error if failed else None,
+            issues=[issue for r in results for issue in r.issues],
+            metadata={
+                "tool": "+".join(r.metadata.get("tool", "") for r in results),
+                "scoped": any(r.metadata.get("scoped") for r in results),
+            },
+        )
+
     def _detect_language(self, path: str) -> str:
         if os.path.isfile(path):
             if path.endswith(".py"):
                 return "python"
         elif os.path.isdir(path):
-            for root, _, files in os.walk(path):
-                for file in files:
-                    if file.endswith(".py"):
-                        return "python"
+            # Same cached, pruned listing the pattern scan walks
+            if FileIndex.get(path, (".py",)):
+                return "python"
         return "unknown"
 
     async def _run_bandit(self, target: str, changed_files: list[str] = None) -> ToolResult:
@@ -72,39 +240,38 @@ class SecurityScannerTool(BaseTool):
                     metadata={"tool": "bandit", "scoped": True},
                 )
             
-            cmd = ["bandit", "-f", "json"] + files_to_scan
+            # Bandit is single-threaded: large PRs run as parallel batches
+            cmds = [
+                ["bandit", "-f", "json"] + files_to_scan[i:i + BANDIT_BATCH_SIZE]
+                for i in range(0, len(files_to_scan), BANDIT_BATCH_SIZE)
+            ]
         else:
-            cmd = ["bandit", "-r", "-f", "json", target]
+            cmds = [["bandit", "-r", "-f", "json", target]]
         
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
-            output = stdout.decode()
+            outputs = await asyncio.gather(*(self._communicate(cmd) for cmd in cmds))
 
             issues = []
-            try:
-                results = json.loads(output) if output.strip() else {}
-                for result in results.get("results", []):
-                    issues.append({
-                        "file": result.get("filename", ""),
-                        "line": result.get("line_number", 0),
-                        "severity": result.get("issue_severity", "").lower(),
-                        "confidence": result.get("issue_confidence", "").lower(),
-                        "message": result.get("issue_text", ""),
-                        "rule": result.get("test_id", ""),
-                        "cwe": result.get("issue_cwe", {}).get("id", ""),
-                        "code_snippet": result.get("code", ""),
-                    })
-            except json.JSONDecodeError:
-                pass
+            for output in outputs:
+                try:
+                    results = json_loads(output) if output.strip() else {}
+                    for result in results.get("results", []):
+                        issues.append({
+                            "file": result.get("filename", ""),
+                            "line": result.get("line_number", 0),
+                            "severity": result.get("issue_severity", "").lower(),
+                            "confidence": result.get("issue_confidence", "").lower(),
+                            "message": result.get("issue_text", ""),
+                            "rule": result.get("test_id", ""),
+                            "cwe": result.get("issue_cwe", {}).get("id", ""),
+                            "code_snippet": result.get("code", ""),
+                        })
+                except json.JSONDecodeError:
+                    pass
 
             return ToolResult(
                 success=True,
-                output=output,
+                output="\n".join(outputs),
                 issues=issues,
                 metadata={"tool": "bandit", "scoped": bool(changed_files)},
             )
@@ -112,44 +279,51 @@ class SecurityScannerTool(BaseTool):
         except Exception as e:
             return ToolResult(success=False, output="", error=str(e))
 
+    @staticmethod
+    async def _communicate(cmd: list[str]) -> str:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            # Progress and warnings on stderr are never read
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await proc.communicate()
+        return stdout.decode()
+
     async def _run_pattern_scan(self, target: str, changed_files: list[str] = None) -> ToolResult:
-        issues = []
+        # Reading and matching is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._pattern_scan, target, changed_files)
 
-        security_patterns = [
-            (r"password\s*=\s*['\"][^'\"]+['\"]", "Hardcoded password detected", "critical", "CWE-259"),
-            (r"api[_-]?key\s*=\s*['\"][^'\"]+['\"]", "Hardcoded API key detected", "critical", "CWE-798"),
-            (r"secret\s*=\s*['\"][^'\"]+['\"]", "Hardcoded secret detected", "critical", "CWE-798"),
-            (r"token\s*=\s*['\"][A-Za-z0-9]{20,}['\"]", "Possible hardcoded token", "high", "CWE-798"),
-            (r"(?:os\.system|subprocess\.call)\s*\([^)]*\+", "Possible command injection", "critical", "CWE-78"),
-            (r"eval\s*\(", "Use of eval() - potential code injection", "high", "CWE-94"),
-            (r"exec\s*\(", "Use of exec() - potential code injection", "high", "CWE-94"),
-            (r"pickle\.loads?\s*\(", "Unsafe deserialization with pickle", "critical", "CWE-502"),
-            (r"yaml\.load\s*\([^)]*\)(?!.*Loader)", "Unsafe YAML loading", "high", "CWE-502"),
-            (r"verify\s*=\s*False", "SSL verification disabled", "high", "CWE-295"),
-            (r"hashlib\.md5\s*\(", "Weak hash function MD5", "medium", "CWE-328"),
-            (r"hashlib\.sha1\s*\(", "Weak hash function SHA1", "medium", "CWE-328"),
-            (r"chmod\s*\(\s*['\"]?\d*7\d*['\"]?\s*\)", "World-writable permissions", "medium", "CWE-732"),
-            (r"debug\s*=\s*True", "Debug mode enabled", "low", "CWE-489"),
-        ]
+    def _pattern_scan(self, target: str, changed_files: Optional[list[str]]) -> ToolResult:
+        issues = []
 
         def scan_file(filepath: str):
             file_issues = []
             try:
-                with open(filepath, "r", errors="ignore") as f:
-                    lines = f.readlines()
-
-                for line_num, line in enumerate(lines, 1):
-                    for pattern, message, severity, cwe in security_patterns:
-                        if re.search(pattern, line, re.IGNORECASE):
-                            file_issues.append({
-                                "file": filepath,
-                                "line": line_num,
-                                "severity": severity,
-                                "message": message,
-                                "rule": f"pattern-{cwe}",
-                                "cwe": cwe,
-                                "code_snippet": line.strip()[:100],
-                            })
+                # None for bundles over MAX_SOURCE_BYTES and binary files
+                data = FileIndex.read_source(filepath)
+                if data is None:
+                    return file_issues
+
+                # Hits don't depend on the path, so files whose content was
+                # already scanned (re-runs, copies) reuse the earlier result
+                key = hashlib.blake2b(data, digest_size=16).digest()
+                hits = self._scan_cache.get(key)
+                if hits is None:
+                    hits = _pattern_hits(data)
+                    self._scan_cache.set(key, hits)
+
+                for line_num, index, snippet in hits:
+                    _, message, severity, cwe = SECURITY_PATTERNS[index]
+                    file_issues.append({
+                        "file": filepath,
+                        "line": line_num,
+                        "severity": severity,
+                        "message": message,
+                        "rule": f"pattern-{cwe}",
+                        "cwe": cwe,
+                        "code_snippet": snippet,
+                    })
             except Exception:
                 pass
             return file_issues
@@ -157,17 +331,15 @@ class SecurityScannerTool(BaseTool):
         # If changed_files provided, only scan those files
         if changed_files:
             for f in changed_files:
-                full_path = os.path.join(target, f)
-                if os.path.exists(full_path) and f.endswith((".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go")):
-                    issues.extend(scan_file(full_path))
+                # Deleted files fail the read in scan_file, no separate exists() stat
+                if f.endswith(PATTERN_SCAN_EXTENSIONS):
+                    issues.extend(scan_file(os.path.join(target, f)))
         elif os.path.isfile(target):
             issues.extend(scan_file(target))
         else:
-            for root, _, files in os.walk(target):
-                for file in files:
-                    if file.endswith((".py", ".js", ".ts", ".jsx", ".tsx", ".java", ".go")):
-                        filepath = os.path.join(root, file)
-                        issues.extend(scan_file(filepath))
+            # Skips dot-directories and dependency dirs such as node_modules
+            for filepath in FileIndex.get(target, PATTERN_SCAN_EXTENSIONS):
+                issues.extend(scan_file(filepath))
 
         return ToolResult(
             success=True,
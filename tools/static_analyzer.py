@@ -2,9 +2,32 @@ import subprocess
 import json
 import os
 import asyncio
+import re
 from typing import Optional
 
-from tools.base import BaseTool, ToolResult
+from core.file_index import MAX_SOURCE_BYTES, FileIndex
+from tools.base import PROBE_TIMEOUT, BaseTool, ToolResult
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# (pattern, message, severity) checks of the fallback analysis when semgrep is missing.
+# The yaml check's atomic group only tries the last ")" of the line, so a long
+# line of parentheses can't make the lookahead rescan it once per ")". It stops
+# at "\n" so the whole-file prefilter below sees the same matches as each line.
+BASIC_ANALYSIS_PATTERNS = [
+    (re.compile(r"eval\s*\("), "Use of eval() is dangerous", "error"),
+    (re.compile(r"exec\s*\("), "Use of exec() is dangerous", "error"),
+    (re.compile(r"__import__\s*\("), "Dynamic import may be security risk", "warning"),
+    (re.compile(r"pickle\.loads?\s*\("), "Pickle deserialization is unsafe", "error"),
+    (re.compile(r"yaml\.load\s*\((?>[^,\n]+\))(?!.*Loader)"), "Use yaml.safe_load instead", "warning"),
+    (re.compile(r"subprocess\..*shell\s*=\s*True"), "Shell=True in subprocess is dangerous", "warning"),
+]
+
+# Union of BASIC_ANALYSIS_PATTERNS, to skip files and lines that match none
+_BASIC_ANALYSIS_ANY = re.compile("|".join(f"(?:{p.pattern})" for p, _, _ in BASIC_ANALYSIS_PATTERNS))
 
 
 class StaticAnalyzerTool(BaseTool):
@@ -14,15 +37,16 @@ class StaticAnalyzerTool(BaseTool):
     def __init__(self, config_path: Optional[str] = None):
         self.config_path = config_path
 
-    def is_available(self) -> bool:
+    def _probe_available(self) -> bool:
         try:
             subprocess.run(
                 ["semgrep", "--version"],
                 capture_output=True,
                 check=True,
+                timeout=PROBE_TIMEOUT,
             )
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError):
             return False
 
     async def run(self, target: str, **kwargs) -> ToolResult:
@@ -46,14 +70,15 @@ class StaticAnalyzerTool(BaseTool):
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                # Progress and warnings on stderr are never read
+                stderr=asyncio.subprocess.DEVNULL,
             )
-            stdout, stderr = await proc.communicate()
+            stdout, _ = await proc.communicate()
             output = stdout.decode()
 
             issues = []
             try:
-                results = json.loads(output) if output.strip() else {}
+                results = json_loads(output) if output.strip() else {}
                 for result in results.get("results", []):
                     issues.append({
                         "file": result.get("path", ""),
@@ -78,40 +103,42 @@ class StaticAnalyzerTool(BaseTool):
             return ToolResult(success=False, output="", error=str(e))
 
     async def _run_basic_analysis(self, target: str) -> ToolResult:
+        # Reading and matching is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._basic_analysis, target)
+
+    def _basic_analysis(self, target: str) -> ToolResult:
         issues = []
-        patterns = [
-            (r"eval\s*\(", "Use of eval() is dangerous", "error"),
-            (r"exec\s*\(", "Use of exec() is dangerous", "error"),
-            (r"__import__\s*\(", "Dynamic import may be security risk", "warning"),
-            (r"pickle\.loads?\s*\(", "Pickle deserialization is unsafe", "error"),
-            (r"yaml\.load\s*\([^,]+\)(?!.*Loader)", "Use yaml.safe_load instead", "warning"),
-            (r"subprocess\..*shell\s*=\s*True", "Shell=True in subprocess is dangerous", "warning"),
-        ]
-
-        import re
-        for root, _, files in os.walk(target) if os.path.isdir(target) else [("", [], [target])]:
-            for file in files:
-                if not file.endswith(".py"):
+        if os.path.isdir(target):
+            # Skips dot-directories and dependency dirs such as node_modules
+            files = FileIndex.get(target, (".py",))
+        else:
+            files = [target] if target.endswith(".py") else []
+
+        for filepath in files:
+            try:
+                with open(filepath, "r") as f:
+                    # Larger files are generated or bundled code
+                    if os.fstat(f.fileno()).st_size > MAX_SOURCE_BYTES:
+                        continue
+                    content = f.read()
+                if not _BASIC_ANALYSIS_ANY.search(content):
                     continue
-                filepath = os.path.join(root, file) if root else file
-                try:
-                    with open(filepath, "r") as f:
-                        content = f.read()
-                        lines = content.split("\n")
-
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, message, severity in patterns:
-                            if re.search(pattern, line):
-                                issues.append({
-                                    "file": filepath,
-                                    "line": line_num,
-                                    "severity": severity,
-                                    "message": message,
-                                    "rule": "basic-analysis",
-                                    "code_snippet": line.strip(),
-                                })
-                except Exception:
-                    pass
+
+                for line_num, line in enumerate(content.split("\n"), 1):
+                    if not _BASIC_ANALYSIS_ANY.search(line):
+                        continue
+                    for pattern, message, severity in BASIC_ANALYSIS_PATTERNS:
+                        if pattern.search(line):
+                            issues.append({
+                                "file": filepath,
+                                "line": line_num,
+                                "severity": severity,
+                                "message": message,
+                                "rule": "basic-analysis",
+                                "code_snippet": line.strip(),
+                            })
+            except Exception:
+                pass
 
         return ToolResult(
             success=True,